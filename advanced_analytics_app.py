@@ -4,20 +4,95 @@ import time
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
-from io import BytesIO
+import os
+import uuid
 import base64
-import requests
+import api_client
+import evaluation_pipeline
+from history_store import InterviewHistory, build_backend
+from figure_cache import FigureCache
+from downsample import downsample_frame
+import reports
+import jd_analyzer
+import follow_up_engine
+from question_bank import BANK, QuestionSampler
+import heuristic_scorer
+from evaluation_cache import get_shared_cache, make_key
+
+st.set_page_config(page_title="AI Interview Analytics", page_icon="📊", layout="wide")
 
 # AWS Lambda API Configuration
 API_URL = "https://m9hiy6bsc4.execute-api.us-east-1.amazonaws.com/Prod"
+EVALUATION_TIMEOUT = 45
+EVALUATION_POLL_INTERVAL = 1  # Longest the end of a run waits for results before rerunning
+EVALUATION_MAX_ABANDONED = 2  # Dropped evaluations a session may still have running before it must wait
+# Use /evaluate/stream to render scores as they are produced; API Gateway REST buffers the response,
+# so only enable this behind a streaming-capable front end
+STREAM_EVALUATION = os.environ.get('STREAM_EVALUATION', '0') == '1'
+EVALUATION_CACHE_BACKEND = os.environ.get('CLIENT_EVALUATION_CACHE_BACKEND', 'tiered')
+EVALUATION_CACHE_PATH = os.environ.get('CLIENT_EVALUATION_CACHE_PATH', 'evaluation_cache.sqlite3')
+# Batch items per request: the Lambda evaluates 4 at a time and must answer inside API Gateway's 29s,
+# so at ~6s per Bedrock evaluation about 16 fit (well under the Lambda's 50-item limit)
+EVALUATION_BATCH_ITEMS = int(os.environ.get('EVALUATION_BATCH_ITEMS', 16))
+EVALUATION_BATCH_RETRIES = 3  # Resubmissions of throttled items before they are scored locally
+EVALUATION_BATCH_MAX_WAIT = 10  # Longest honoured Retry-After, in seconds
+EVALUATION_CRITERIA = ['technical_accuracy', 'clarity', 'confidence', 'communication', 'relevance']
+TREND_MAX_POINTS = 1000  # Point budget for the trend chart before downsampling
+TREND_MARKER_LIMIT = 200
+TREND_WINDOWS = {
+    "All time": None,
+    "Last 100": ('records', 100),
+    "Last 500": ('records', 500),
+    "Last 30 days": ('days', 30),
+    "Last 7 days": ('days', 7)
+}
+REPORT_DATE_RANGES = {"Last 7 days": 7, "Last 30 days": 30, "All time": None}
+EXPORT_FILE_TYPES = {
+    "Excel": ('xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": ('csv', "text/csv"),
+    "Parquet": ('parquet', "application/vnd.apache.parquet")
+}
+
+@st.cache_resource(show_spinner=False)
+def get_history_backend():
+    """Shared on-disk interview history for all sessions on this server"""
+    return build_backend()
+
+def get_evaluation_cache():
+    """Evaluation results shared by all sessions: per-process LRU over an on-disk store shared by workers"""
+    # Namespaced by the server's prompt version, so a new prompt or model never gets old evaluations;
+    # while the version is unknown nothing is cached
+    version = api_client.prompt_version(API_URL)
+    if version is None:
+        return get_shared_cache(None, backend='none')
+    # Module-level in evaluation_cache (not st.cache_resource) so evaluation worker threads get the same instance
+    return get_shared_cache(f"{API_URL}/evaluate/{version}", backend=EVALUATION_CACHE_BACKEND,
+                            path=EVALUATION_CACHE_PATH)
+
+def session_profile():
+    """History profile for this session: ?profile=name, else a fresh id written back to the URL"""
+    params = st.experimental_get_query_params()
+    if params.get('profile'):
+        return params['profile'][0]
+    # Sessions never share a profile by default; the URL lets the user come back to theirs
+    profile = uuid.uuid4().hex
+    st.experimental_set_query_params(**dict(params, profile=profile))
+    return profile
+
+def load_history():
+    """Load this session's history profile from the shared backend"""
+    backend = get_history_backend()
+    if backend is None:
+        return InterviewHistory()
+    return InterviewHistory.load(backend, session_profile())
 
 # Initialize session state
 if 'current_question' not in st.session_state:
     st.session_state.current_question = ""
 if 'interview_history' not in st.session_state:
-    st.session_state.interview_history = []
+    st.session_state.interview_history = load_history()
 if 'difficulty' not in st.session_state:
     st.session_state.difficulty = 'easy'
 if 'current_round' not in st.session_state:
@@ -30,6 +105,14 @@ if 'follow_up_questions' not in st.session_state:
     st.session_state.follow_up_questions = []
 if 'coding_challenge_mode' not in st.session_state:
     st.session_state.coding_challenge_mode = False
+if 'evaluation_job' not in st.session_state:
+    st.session_state.evaluation_job = None
+if 'abandoned_jobs' not in st.session_state:
+    st.session_state.abandoned_jobs = []
+if 'figure_cache' not in st.session_state:
+    st.session_state.figure_cache = FigureCache()
+if 'question_sampler' not in st.session_state:
+    st.session_state.question_sampler = QuestionSampler(BANK)
 
 # Industry benchmarks data
 INDUSTRY_BENCHMARKS = {
@@ -65,185 +148,28 @@ INDUSTRY_BENCHMARKS = {
     }
 }
 
-# Company-specific questions database
-COMPANY_QUESTIONS = {
-    'google': [
-        "How would you handle Google's scale of data processing?",
-        "Explain how you'd contribute to Google's mission to organize world's information",
-        "How do you approach innovation at Google's pace?"
-    ],
-    'amazon': [
-        "How would you apply Amazon's leadership principles in your role?",
-        "Describe how you'd optimize for customer obsession",
-        "How do you handle Amazon's high-performance culture?"
-    ],
-    'microsoft': [
-        "How would you contribute to Microsoft's cloud-first strategy?",
-        "Explain your approach to inclusive design",
-        "How do you embody Microsoft's growth mindset?"
-    ],
-    'meta': [
-        "How would you build for the next billion users?",
-        "Explain your approach to connecting people globally",
-        "How do you handle Meta's move fast philosophy?"
-    ]
-}
-
-# Coding challenges database
-CODING_CHALLENGES = {
-    'easy': [
-        "Write a function to reverse a string",
-        "Find the maximum element in an array",
-        "Check if a string is a palindrome",
-        "Implement FizzBuzz"
-    ],
-    'medium': [
-        "Implement a binary search algorithm",
-        "Find the longest substring without repeating characters",
-        "Merge two sorted linked lists",
-        "Validate a binary search tree"
-    ],
-    'hard': [
-        "Design and implement an LRU cache",
-        "Find median of two sorted arrays",
-        "Serialize and deserialize a binary tree",
-        "Implement a trie data structure"
-    ]
-}
-
 def generate_jd_based_question(job_description, role):
     """Generate questions based on job description"""
     if not job_description.strip():
         return None
     
-    # Extract key technologies and skills from JD
-    jd_lower = job_description.lower()
-    
-    # Technology-based questions
-    if 'python' in jd_lower:
-        return "Based on the job requirement for Python, how would you optimize Python code for performance?"
-    elif 'react' in jd_lower:
-        return "The role mentions React - how would you handle state management in a large React application?"
-    elif 'aws' in jd_lower:
-        return "Given the AWS requirement, how would you design a scalable cloud architecture?"
-    elif 'machine learning' in jd_lower or 'ml' in jd_lower:
-        return "The position requires ML expertise - how would you approach model deployment in production?"
-    elif 'kubernetes' in jd_lower:
-        return "Based on the Kubernetes requirement, how would you handle container orchestration at scale?"
-    
-    # Experience-based questions
-    if 'senior' in jd_lower:
-        return "As a senior role, how would you mentor junior team members while delivering on technical goals?"
-    elif 'lead' in jd_lower:
-        return "This leadership position requires - how would you balance technical decisions with team management?"
+    # Top-ranked skill from one pass of the compiled taxonomy matcher
+    questions = jd_analyzer.rank_questions(job_description, role)
+    if questions:
+        return questions[0]
     
     # Default fallback
     return f"Based on this job description, how would your experience align with the key requirements mentioned?"
 
-def generate_follow_up_question(previous_answer, question_type):
+def generate_follow_up_question(previous_answer, question_type, recent=()):
     """Generate follow-up questions based on previous answers"""
-    answer_lower = previous_answer.lower()
-    
-    # Technical follow-ups
-    if 'database' in answer_lower or 'sql' in answer_lower:
-        return "You mentioned databases - how would you handle database performance optimization at scale?"
-    elif 'api' in answer_lower:
-        return "Regarding APIs - how would you ensure API security and rate limiting?"
-    elif 'microservices' in answer_lower:
-        return "You brought up microservices - how do you handle inter-service communication and data consistency?"
-    elif 'testing' in answer_lower:
-        return "Since you mentioned testing - what's your approach to test-driven development?"
-    elif 'performance' in answer_lower:
-        return "You talked about performance - how do you identify and resolve bottlenecks?"
-    
-    # Behavioral follow-ups
-    elif 'team' in answer_lower:
-        return "You mentioned teamwork - can you describe a time when you had to resolve a team conflict?"
-    elif 'challenge' in answer_lower or 'difficult' in answer_lower:
-        return "You described challenges - how do you typically approach problem-solving under pressure?"
-    elif 'project' in answer_lower:
-        return "Regarding that project - what would you do differently if you had to start over?"
-    
-    # Generic follow-ups
-    return "Can you elaborate on that with a specific example from your experience?"
-
-# Questions database
-QUESTIONS = {
-    'sde': {
-        'technical': [
-            "Design a URL shortener like bit.ly with high availability",
-            "Implement rate limiting for an API",
-            "Design a chat application system architecture",
-            "How would you handle database scaling?",
-            "Explain microservices vs monolithic architecture"
-        ],
-        'hr': [
-            "Why do you want to work in software engineering?",
-            "Describe your coding journey and what motivates you",
-            "How do you debug complex technical issues?",
-            "Tell me about a challenging project you worked on",
-            "How do you stay updated with new technologies?"
-        ],
-        'managerial': [
-            "How would you mentor junior developers?",
-            "How do you prioritize features with tight deadlines?",
-            "How would you handle technical debt in a project?",
-            "Describe your approach to code reviews",
-            "How do you handle disagreements in technical decisions?"
-        ]
-    },
-    'ml': {
-        'technical': [
-            "Design a recommendation system for e-commerce",
-            "How do you handle imbalanced datasets?",
-            "Explain the bias-variance tradeoff",
-            "How would you deploy an ML model at scale?",
-            "What's your approach to feature engineering?"
-        ],
-        'hr': [
-            "Why did you choose machine learning?",
-            "How do you explain ML concepts to non-technical people?",
-            "How do you stay updated with ML research?",
-            "Describe a challenging ML project you worked on",
-            "What's your favorite ML algorithm and why?"
-        ],
-        'managerial': [
-            "How would you lead an ML team?",
-            "How do you balance model accuracy vs speed?",
-            "How do you manage ML project timelines?",
-            "How do you handle model performance degradation?",
-            "How do you ensure ML model fairness?"
-        ]
-    },
-    'cloud': {
-        'technical': [
-            "Design a multi-region cloud architecture",
-            "How do you implement auto-scaling?",
-            "What are your cloud cost optimization strategies?",
-            "Explain containerization vs virtualization",
-            "How do you ensure cloud security?"
-        ],
-        'hr': [
-            "Why cloud computing over traditional infrastructure?",
-            "How do you explain cloud benefits to clients?",
-            "How do you handle cloud migration challenges?",
-            "Describe your experience with cloud platforms",
-            "What cloud certifications do you have?"
-        ],
-        'managerial': [
-            "How would you lead a cloud transformation?",
-            "How do you balance security vs accessibility?",
-            "How do you manage cloud budgets?",
-            "How do you handle cloud vendor lock-in?",
-            "How do you ensure cloud compliance?"
-        ]
-    }
-}
+    # Highest-scoring rule for this round that was not asked recently
+    return follow_up_engine.get_engine().choose(previous_answer, question_type, recent)
 
 def get_ai_question(difficulty, category, personality):
     """Get AI-generated question from Lambda API"""
     try:
-        response = requests.post(f"{API_URL}/question", json={
+        response = api_client.post_json(f"{API_URL}/question", {
             'difficulty': difficulty,
             'category': category,
             'personality': personality
@@ -256,48 +182,256 @@ def get_ai_question(difficulty, category, personality):
     except:
         return "Tell me about your experience with this technology."
 
-def evaluate_answer_ai(question, answer):
+def evaluate_answer_ai(question, answer, round_name=None):
     """Evaluate answer using AI via Lambda API"""
+    cache = get_evaluation_cache()
+    cached = cache.get(question, answer)
+    if cached is not None:
+        return evaluation_from_result(cached)
+    
+    try:
+        result = evaluation_pipeline.evaluation_flight.do(make_key(question, answer, API_URL),
+                                                          request_evaluation, question, answer)
+        # Stored under the version the server answered with, which may be newer than the lookup's
+        get_evaluation_cache().set(question, answer, result)
+        return evaluation_from_result(result)
+    except:
+        return fallback_evaluation(question, answer, round_name)
+
+def request_evaluation(question, answer):
+    """POST one answer to the Lambda /evaluate route"""
+    response = api_client.post_json(f"{API_URL}/evaluate", {
+        'question': question,
+        'answer': answer
+    }, timeout=api_client.MODEL_TIMEOUT)
+    
+    if response.status_code == 200:
+        api_client.note_prompt_version(API_URL, response)
+        return response.json()
+    else:
+        raise Exception("API Error")
+
+def evaluate_answer_ai_stream(question, answer, round_name=None):
+    """Stream an AI evaluation, yielding (field, value) pairs as the model completes them"""
+    cache = get_evaluation_cache()
+    cached = cache.get(question, answer)
+    if cached is not None:
+        for key, value in cached.items():
+            yield key, value
+        return evaluation_from_result(cached)
+    
+    result = {}
     try:
-        response = requests.post(f"{API_URL}/evaluate", json={
+        for event, data in api_client.stream_events(f"{API_URL}/evaluate/stream", {
             'question': question,
             'answer': answer
-        }, timeout=15)
+        }, timeout=api_client.MODEL_TIMEOUT):
+            if event == 'field':
+                result[data['key']] = data['value']
+                yield data['key'], data['value']
+            elif event == 'done':
+                result = data
+                cache.set(question, answer, result)
+            elif event == 'error':
+                raise Exception(data.get('error', 'API Error'))
+    except Exception as e:
+        # Deployments without the streaming route still answer on /evaluate; timeouts, throttling
+        # and server errors fall back locally rather than paying for the evaluation twice
+        status = getattr(getattr(e, 'response', None), 'status_code', None)
+        if not result and status in (403, 404):
+            return evaluate_answer_ai(question, answer, round_name)
+        return fallback_evaluation(question, answer, round_name)
+    
+    return evaluation_from_result(result)
+
+def evaluate_answers_batch(pairs, round_name=None):
+    """Evaluate many (question, answer) pairs in deadline-sized batch calls, resubmitting throttled items"""
+    cache = get_evaluation_cache()
+    evaluations = [cache.get(question, answer) for question, answer in pairs]
+    pending = [index for index, evaluation in enumerate(evaluations) if evaluation is None]
+    
+    # Chunks start sized to the gateway deadline and halve whenever the server reports throttling;
+    # throttled items are resubmitted after the server's Retry-After instead of being scored locally
+    queue = list(pending)
+    chunk_size = EVALUATION_BATCH_ITEMS
+    retries = dict.fromkeys(pending, 0)
+    while queue:
+        chunk, queue = queue[:chunk_size], queue[chunk_size:]
+        try:
+            response = api_client.post_json(f"{API_URL}/evaluate/batch", {
+                'items': [{'question': pairs[index][0], 'answer': pairs[index][1]} for index in chunk]
+            }, timeout=api_client.MODEL_TIMEOUT)
+            
+            if response.status_code == 200:
+                api_client.note_prompt_version(API_URL, response)
+                cache = get_evaluation_cache()
+                results = response.json()['results']
+            elif response.status_code == 429:
+                retry_after = float(response.headers.get('Retry-After', 1))
+                results = [{'status': 'throttled', 'retry_after': retry_after}] * len(chunk)
+            else:
+                raise Exception("API Error")
+        except:
+            results = [{'status': 'error'}] * len(chunk)
         
-        if response.status_code == 200:
-            result = response.json()
-            return {
-                'technical_accuracy': result.get('technical_accuracy', 7),
-                'clarity': result.get('clarity', 7),
-                'confidence': result.get('confidence', 6),
-                'communication': result.get('communication', 7),
-                'relevance': result.get('relevance', 7),
-                'completeness': result.get('technical_accuracy', 7),  # Map to available field
-                'structure': result.get('clarity', 7)  # Map to available field
-            }, result.get('feedback', 'Good response'), result.get('improved_answer', '')
+        throttled, wait = [], 0
+        for index, result in zip(chunk, results):
+            if result['status'] == 'ok':
+                evaluations[index] = result['evaluation']
+                cache.set(*pairs[index], result['evaluation'])
+            elif result['status'] == 'throttled' and retries[index] < EVALUATION_BATCH_RETRIES:
+                retries[index] += 1
+                throttled.append(index)
+                wait = max(wait, result.get('retry_after') or 1)
+        
+        if throttled:
+            chunk_size = max(1, chunk_size // 2)
+            time.sleep(min(wait, EVALUATION_BATCH_MAX_WAIT) * random.uniform(1, 1.5))
+            queue = throttled + queue
         else:
-            raise Exception("API Error")
-    except:
-        # Fallback to basic scoring
-        return {
-            'technical_accuracy': random.randint(6, 9),
-            'clarity': random.randint(6, 9),
-            'confidence': random.randint(5, 8),
-            'communication': random.randint(6, 9),
-            'relevance': random.randint(6, 9),
-            'completeness': random.randint(6, 8),
-            'structure': random.randint(6, 8)
-        }, "Good technical understanding. Consider adding more examples.", ""
-
-def create_performance_chart(df):
-    """Create performance trend chart"""
+            chunk_size = min(EVALUATION_BATCH_ITEMS, chunk_size * 2)
+    
+    # Hard failures (and items still throttled after the retries) fall back to local scoring, marked
+    # evaluator='heuristic', so one bad answer does not sink the batch
+    failed = [index for index, evaluation in enumerate(evaluations) if evaluation is None]
+    for index, evaluation in zip(failed, heuristic_scorer.score_answers([pairs[index] for index in failed], round_name)):
+        evaluations[index] = evaluation
+    return [evaluation_from_result(evaluation) for evaluation in evaluations]
+
+def evaluation_from_result(result):
+    """Map an API evaluation payload to (scores, feedback, improved answer, evaluator)"""
+    return {
+        'technical_accuracy': result.get('technical_accuracy', 7),
+        'clarity': result.get('clarity', 7),
+        'confidence': result.get('confidence', 6),
+        'communication': result.get('communication', 7),
+        'relevance': result.get('relevance', 7),
+        'completeness': result.get('technical_accuracy', 7),  # Map to available field
+        'structure': result.get('clarity', 7)  # Map to available field
+    }, result.get('feedback', 'Good response'), result.get('improved_answer', ''), result.get('evaluator', 'model')
+
+def fallback_evaluation(question, answer, round_name=None):
+    """Local heuristic scoring used when the AI evaluation is unavailable"""
+    return evaluation_from_result(heuristic_scorer.score_answer(question, answer, round_name))
+
+def apply_evaluation_result(job, name):
+    """Store a landed evaluation result in session state exactly once"""
+    if name in job.applied or name not in job.results:
+        return
+    job.applied.add(name)
+    
+    if name == 'evaluation':
+        scores, feedback, improved_answer, evaluator = job.results['evaluation']
+        overall = sum(scores.values()) / len(scores)
+        interview_record = dict(
+            job.context,
+            timestamp=datetime.now(),
+            scores=scores,
+            overall_score=overall,
+            evaluator=evaluator,
+            duration=random.randint(60, 180)
+        )
+        st.session_state.interview_history.append(interview_record)
+    elif name == 'follow_up':
+        st.session_state.follow_up_questions.append(job.results['follow_up'])
+
+def drop_evaluation_job():
+    """Cancel the current evaluation, tracking it while its tasks still hold executor workers"""
+    job = st.session_state.evaluation_job
+    if job is not None:
+        job.cancel()
+        if job.running:
+            st.session_state.abandoned_jobs.append(job)
+    st.session_state.evaluation_job = None
+
+def create_evaluation_slots():
+    """Reserve placeholders for evaluation results in landing order"""
+    status = st.empty()
+    col1, col2 = st.columns(2)
+    with col1:
+        scores = st.empty()
+    with col2:
+        feedback = st.empty()
+        follow_up = st.container()
+    return {'status': status, 'scores': scores, 'feedback': feedback, 'follow_up': follow_up}
+
+def render_evaluation_progress(job, name, slots):
+    """Render the fields of a streaming evaluation that have arrived so far"""
+    if name != 'evaluation' or name in job.results:
+        return
+    partial = job.partials['evaluation']
+    
+    with slots['scores'].container():
+        st.subheader("📈 Detailed Scores")
+        for criterion in EVALUATION_CRITERIA:
+            if criterion in partial:
+                st.write(f"**{criterion.replace('_', ' ').title()}:** {partial[criterion]}/10")
+    
+    if 'feedback' in partial or 'improved_answer' in partial:
+        with slots['feedback'].container():
+            st.subheader("💡 AI Feedback")
+            st.write(partial.get('feedback', '...'))
+            if partial.get('improved_answer'):
+                st.subheader("💡 Improved Answer Suggestion")
+                st.info(partial['improved_answer'])
+
+def render_evaluation_result(job, name, slots):
+    """Render one landed evaluation task into its placeholder"""
+    apply_evaluation_result(job, name)
+    
+    if name in job.errors:
+        slots['status'].error(f"Evaluation step '{name}' failed: {job.errors[name]}")
+        return
+    
+    if name == 'evaluation':
+        scores, feedback, improved_answer, evaluator = job.results['evaluation']
+        overall = sum(scores.values()) / len(scores)
+        role_key = job.context['role']
+        
+        if name in job.timed_out:
+            slots['status'].error(f"⏱️ AI evaluation did not finish within {EVALUATION_TIMEOUT}s - "
+                                  f"showing the local heuristic score instead: {overall:.1f}/10")
+        elif evaluator == 'heuristic':
+            slots['status'].warning(f"🎯 Overall Score: {overall:.1f}/10 (local heuristic score - AI evaluation unavailable)")
+        else:
+            slots['status'].success(f"🎯 Overall Score: {overall:.1f}/10")
+        
+        with slots['scores'].container():
+            st.subheader("📈 Detailed Scores")
+            for criterion, score in scores.items():
+                benchmark = INDUSTRY_BENCHMARKS[role_key].get(criterion, 7.0)
+                color = "🟢" if score >= benchmark else "🟡" if score >= benchmark - 1 else "🔴"
+                st.write(f"{color} **{criterion.replace('_', ' ').title()}:** {score}/10 (Benchmark: {benchmark})")
+        
+        with slots['feedback'].container():
+            st.subheader("💡 AI Feedback")
+            st.write(feedback)
+            if improved_answer:
+                st.subheader("💡 Improved Answer Suggestion")
+                st.info(improved_answer)
+    
+    elif name == 'follow_up':
+        latest_followup = job.results['follow_up']
+        with slots['follow_up']:
+            st.subheader("🔄 Follow-up Question")
+            st.info(f"💭 {latest_followup}")
+            
+            if st.button("Use This Follow-up", key="use_followup"):
+                st.session_state.current_question = latest_followup
+                drop_evaluation_job()
+                st.rerun()
+
+def create_performance_chart(df, max_points=TREND_MAX_POINTS):
+    """Create performance trend chart, LTTB-downsampled above max_points"""
+    total = len(df)
+    df = downsample_frame(df, 'timestamp', 'overall_score', max_points)
     fig = go.Figure()
     
     # Add overall score trend
     fig.add_trace(go.Scatter(
         x=df['timestamp'],
         y=df['overall_score'],
-        mode='lines+markers',
+        mode='lines+markers' if len(df) <= TREND_MARKER_LIMIT else 'lines',
         name='Your Performance',
         line=dict(color='#007bff', width=3),
         marker=dict(size=8)
@@ -313,7 +447,7 @@ def create_performance_chart(df):
     )
     
     fig.update_layout(
-        title="Performance Trend Over Time",
+        title="Performance Trend Over Time" if len(df) == total else f"Performance Trend Over Time ({len(df)} of {total} points)",
         xaxis_title="Date",
         yaxis_title="Score",
         height=400,
@@ -361,120 +495,70 @@ def create_skills_radar_chart(latest_scores, role):
     
     return fig
 
-def export_to_excel(df):
-    """Export interview data to Excel"""
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Main data
-        df.to_excel(writer, sheet_name='Interview History', index=False)
-        
-        # Summary statistics
-        summary_data = {
-            'Metric': ['Total Interviews', 'Average Score', 'Best Score', 'Latest Score', 'Improvement Rate'],
-            'Value': [
-                len(df),
-                f"{df['overall_score'].mean():.2f}",
-                f"{df['overall_score'].max():.2f}",
-                f"{df['overall_score'].iloc[-1]:.2f}" if len(df) > 0 else "N/A",
-                f"{((df['overall_score'].iloc[-1] - df['overall_score'].iloc[0]) / df['overall_score'].iloc[0] * 100):.1f}%" if len(df) > 1 else "N/A"
-            ]
-        }
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Skills breakdown
-        if len(df) > 0:
-            latest_scores = df.iloc[-1]['scores']
-            skills_data = {
-                'Skill': list(latest_scores.keys()),
-                'Your Score': list(latest_scores.values()),
-                'Industry Benchmark': [INDUSTRY_BENCHMARKS['sde'][skill] for skill in latest_scores.keys()],
-                'Gap': [latest_scores[skill] - INDUSTRY_BENCHMARKS['sde'][skill] for skill in latest_scores.keys()]
-            }
-            skills_df = pd.DataFrame(skills_data)
-            skills_df.to_excel(writer, sheet_name='Skills Analysis', index=False)
-    
-    return output.getvalue()
-
-def generate_pdf_report():
-    """Generate PDF report (simplified version)"""
-    # This would typically use libraries like reportlab or weasyprint
-    # For now, we'll create a simple HTML report that can be printed to PDF
-    
-    df = pd.DataFrame(st.session_state.interview_history)
-    
-    html_content = f"""
-    <html>
-    <head>
-        <title>Interview Performance Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            .header {{ text-align: center; color: #007bff; }}
-            .section {{ margin: 30px 0; }}
-            .metric {{ display: inline-block; margin: 10px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-            table {{ width: 100%; border-collapse: collapse; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            th {{ background-color: #f2f2f2; }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🤖 AI Interview Performance Report</h1>
-            <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-        
-        <div class="section">
-            <h2>📊 Performance Summary</h2>
-            <div class="metric">
-                <strong>Total Interviews:</strong> {len(df)}
-            </div>
-            <div class="metric">
-                <strong>Average Score:</strong> {df['overall_score'].mean():.2f}/10
-            </div>
-            <div class="metric">
-                <strong>Best Performance:</strong> {df['overall_score'].max():.2f}/10
-            </div>
-        </div>
-        
-        <div class="section">
-            <h2>📈 Recent Interview History</h2>
-            <table>
-                <tr>
-                    <th>Date</th>
-                    <th>Role</th>
-                    <th>Round</th>
-                    <th>Score</th>
-                </tr>
-    """
-    
-    for _, row in df.tail(10).iterrows():
-        html_content += f"""
-                <tr>
-                    <td>{row['timestamp'].strftime('%Y-%m-%d')}</td>
-                    <td>{row['role'].upper()}</td>
-                    <td>{row['round'].title()}</td>
-                    <td>{row['overall_score']:.1f}/10</td>
-                </tr>
-        """
-    
-    html_content += """
-            </table>
-        </div>
-    </body>
-    </html>
-    """
+def export_to_excel(history, since=None):
+    """Export interview data to Excel, streaming history rows into a write-only workbook"""
+    stats = history.aggregates.overall
+    summary_rows = [
+        ['Total Interviews', stats.count],
+        ['Average Score', f"{stats.mean:.2f}"],
+        ['Best Score', f"{stats.maximum:.2f}" if stats.count else "N/A"],
+        ['Latest Score', f"{stats.last:.2f}" if stats.count else "N/A"],
+        ['Improvement Rate', f"{stats.improvement:.1f}%" if stats.improvement is not None else "N/A"]
+    ]
+    
+    latest_scores = history.latest_scores()
+    benchmarks = INDUSTRY_BENCHMARKS['sde']
+    skills_rows = [
+        [skill, score, benchmarks.get(skill), score - benchmarks[skill] if skill in benchmarks else None]
+        for skill, score in latest_scores.items()
+    ]
     
-    return html_content
+    columns = history.export_columns()
+    sheets = [
+        ('Interview History', columns, reports.frame_rows(history.iter_frames(reports.EXPORT_CHUNK_ROWS, since=since), columns)),
+        ('Summary', ['Metric', 'Value'], summary_rows)
+    ]
+    if skills_rows:
+        sheets.append(('Skills Analysis', ['Skill', 'Your Score', 'Industry Benchmark', 'Gap'], skills_rows))
+    
+    return reports.write_excel(sheets)
 
-st.set_page_config(page_title="AI Interview Analytics", page_icon="📊", layout="wide")
+def export_history(history, export_format, since=None):
+    """Export interview history as a spooled file in the chosen format"""
+    if export_format == 'Excel':
+        return export_to_excel(history, since)
+    frames = history.iter_frames(reports.EXPORT_CHUNK_ROWS, since=since)
+    if export_format == 'Parquet':
+        return reports.write_parquet(frames, history.export_columns())
+    return reports.write_csv(frames, history.export_columns())
+
+def generate_pdf_report(history, recent=None, pdf=False):
+    """Generate the performance report as HTML (printable to PDF) or PDF, for full history or the most recent interviews"""
+    stats = history.aggregates.overall
+    summary = {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'total': stats.count,
+        'average': f"{stats.mean:.2f}",
+        'best': f"{stats.maximum:.2f}" if stats.count else "N/A"
+    }
+    
+    if recent:
+        frames = [history.to_frame().tail(recent)]
+        title = "Recent Interview History"
+    else:
+        frames = history.iter_frames(reports.EXPORT_CHUNK_ROWS)
+        title = "Interview History"
+    
+    if pdf:
+        return reports.write_pdf_report(summary, frames, title)
+    return reports.write_html_report(summary, frames, title)
 
 st.title("📊 AI Interview Engine with Advanced Analytics")
 st.markdown("*Track your progress, compare with industry standards, and export detailed reports*")
 st.info("🚀 Now powered by AWS Bedrock AI for real question generation and evaluation!")
 
 # Main tabs
+evaluation_slots = None
 tab1, tab2, tab3, tab4 = st.tabs(["🎯 Interview", "📈 Analytics", "📊 Benchmarks", "📄 Reports"])
 
 with tab1:
@@ -547,28 +631,36 @@ with tab1:
             ai_question = get_ai_question(st.session_state.difficulty, st.session_state.current_round, personality.lower())
             st.session_state.current_question = ai_question
             st.session_state.follow_up_questions = []  # Reset follow-ups
+            drop_evaluation_job()
     
     elif jd_question and st.session_state.job_description:
         jd_q = generate_jd_based_question(st.session_state.job_description, role_key)
         if jd_q:
             st.session_state.current_question = jd_q
+            drop_evaluation_job()
             st.success("Generated question based on job description!")
+            detected_skills = jd_analyzer.analyze_job_description(st.session_state.job_description, role_key)
+            if detected_skills:
+                st.caption("Detected skills: " + ", ".join(match.skill.replace('_', ' ') for match in detected_skills))
         else:
             st.warning("Please provide a job description first")
     
     elif company_question and st.session_state.company_name:
-        if st.session_state.company_name in COMPANY_QUESTIONS:
-            company_q = random.choice(COMPANY_QUESTIONS[st.session_state.company_name])
+        company_q = st.session_state.question_sampler.next(round='company', company=st.session_state.company_name)
+        if company_q:
             st.session_state.current_question = company_q
+            drop_evaluation_job()
             st.success(f"Generated {st.session_state.company_name.title()}-specific question!")
         else:
             st.session_state.current_question = f"How would you contribute to {st.session_state.company_name.title()}'s mission and values?"
+            drop_evaluation_job()
             st.info("Generated generic company question")
     
     elif coding_challenge:
         if st.session_state.coding_challenge_mode:
-            challenge = random.choice(CODING_CHALLENGES[st.session_state.difficulty])
+            challenge = st.session_state.question_sampler.next(round='coding', difficulty=st.session_state.difficulty)
             st.session_state.current_question = f"Coding Challenge: {challenge}"
+            drop_evaluation_job()
             st.success("Generated coding challenge!")
         else:
             st.warning("Enable coding challenge mode first")
@@ -604,96 +696,92 @@ with tab1:
             placeholder="Provide your detailed response here..."
         )
         
-        # Evaluation
+        # Evaluation runs in the background; results are drained at the end of the script
         if st.button("📊 Submit & Get Evaluation", type="primary", use_container_width=True):
-            if answer.strip():
-                with st.spinner("🤖 AI is evaluating your response..."):
-                    # Get AI evaluation
-                    scores, feedback, improved_answer = evaluate_answer_ai(st.session_state.current_question, answer)
-                    overall = sum(scores.values()) / len(scores)
-                    
-                    # Generate follow-up question
-                    follow_up = generate_follow_up_question(answer, st.session_state.current_round)
-                    st.session_state.follow_up_questions.append(follow_up)
-                    
-                    # Store in history
-                    interview_record = {
-                        'timestamp': datetime.now(),
-                        'role': role_key,
-                        'round': st.session_state.current_round,
-                        'question': st.session_state.current_question,
-                        'answer': answer,
-                        'scores': scores,
-                        'overall_score': overall,
-                        'answer_length': len(answer.split()),
-                        'duration': random.randint(60, 180),
-                        'question_type': 'jd_based' if 'Based on' in st.session_state.current_question else 'standard',
-                        'company': st.session_state.company_name if st.session_state.company_name else 'generic'
-                    }
-                    
-                    st.session_state.interview_history.append(interview_record)
-                    
-                    # Display results
-                    st.success(f"🎯 Overall Score: {overall:.1f}/10")
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.subheader("📈 Detailed Scores")
-                        for criterion, score in scores.items():
-                            benchmark = INDUSTRY_BENCHMARKS[role_key].get(criterion, 7.0)
-                            color = "🟢" if score >= benchmark else "🟡" if score >= benchmark - 1 else "🔴"
-                            st.write(f"{color} **{criterion.replace('_', ' ').title()}:** {score}/10 (Benchmark: {benchmark})")
-                    
-                    with col2:
-                        st.subheader("💡 AI Feedback")
-                        st.write(feedback)
-                        if improved_answer:
-                            st.subheader("💡 Improved Answer Suggestion")
-                            st.info(improved_answer)
-                        
-                        # Show follow-up question
-                        if st.session_state.follow_up_questions:
-                            st.subheader("🔄 Follow-up Question")
-                            latest_followup = st.session_state.follow_up_questions[-1]
-                            st.info(f"💭 {latest_followup}")
-                            
-                            if st.button("Use This Follow-up", key="use_followup"):
-                                st.session_state.current_question = latest_followup
-                                st.rerun()
+            # Dropped jobs keep their workers until their model calls return, so cap them per session
+            # to stop repeated submits from filling the executor every session shares
+            st.session_state.abandoned_jobs = [job for job in st.session_state.abandoned_jobs if job.running]
+            if len(st.session_state.abandoned_jobs) >= EVALUATION_MAX_ABANDONED:
+                st.warning("Your previous evaluations are still finishing - please submit again in a few seconds")
+            elif answer.strip():
+                drop_evaluation_job()
+                st.session_state.evaluation_job = evaluation_pipeline.submit_evaluation({
+                    'evaluation': (evaluate_answer_ai_stream if STREAM_EVALUATION else evaluate_answer_ai,
+                                   (st.session_state.current_question, answer, st.session_state.current_round)),
+                    'follow_up': (generate_follow_up_question, (answer, st.session_state.current_round,
+                                                                tuple(st.session_state.follow_up_questions)))
+                }, context={
+                    'role': role_key,
+                    'round': st.session_state.current_round,
+                    'question': st.session_state.current_question,
+                    'answer': answer,
+                    'answer_length': len(answer.split()),
+                    'question_type': 'jd_based' if 'Based on' in st.session_state.current_question else 'standard',
+                    'company': st.session_state.company_name if st.session_state.company_name else 'generic'
+                })
             else:
                 st.warning("Please provide an answer")
 
+        if st.session_state.evaluation_job is not None:
+            evaluation_slots = create_evaluation_slots()
+            st.session_state.evaluation_job.poll()
+            render_evaluation_progress(st.session_state.evaluation_job, 'evaluation', evaluation_slots)
+            for name in list(st.session_state.evaluation_job.results) + list(st.session_state.evaluation_job.errors):
+                render_evaluation_result(st.session_state.evaluation_job, name, evaluation_slots)
+
 with tab2:
     st.header("📈 Performance Analytics")
     
     if st.session_state.interview_history:
-        df = pd.DataFrame(st.session_state.interview_history)
+        view = st.session_state.interview_history.time_view()
+        
+        stats = st.session_state.interview_history.aggregates
+        figures = st.session_state.figure_cache
+        version = st.session_state.interview_history.version
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Interviews", len(df))
+            st.metric("Total Interviews", stats.overall.count)
         
         with col2:
-            avg_score = df['overall_score'].mean()
-            st.metric("Average Score", f"{avg_score:.1f}/10")
+            st.metric("Average Score", f"{stats.overall.mean:.1f}/10")
         
         with col3:
-            best_score = df['overall_score'].max()
-            st.metric("Best Score", f"{best_score:.1f}/10")
+            st.metric("Best Score", f"{stats.overall.maximum:.1f}/10")
         
         with col4:
-            if len(df) > 1:
-                improvement = ((df['overall_score'].iloc[-1] - df['overall_score'].iloc[0]) / df['overall_score'].iloc[0]) * 100
-                st.metric("Improvement", f"{improvement:.1f}%")
+            if stats.overall.improvement is not None:
+                st.metric("Improvement", f"{stats.overall.improvement:.1f}%")
             else:
                 st.metric("Improvement", "N/A")
         
         # Performance trend chart
         st.subheader("📊 Performance Trend")
-        fig = create_performance_chart(df)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            trend_window = st.selectbox("Trend Window", list(TREND_WINDOWS))
+        with col2:
+            full_resolution = st.checkbox("Full resolution", value=False,
+                                          help="Plot every point instead of a downsampled trend")
+        
+        window = TREND_WINDOWS[trend_window]
+        # Day windows move with the clock, so their start (floored to the minute) is part of the figure key
+        trend_since = None
+        if window is not None and window[0] == 'days':
+            trend_since = pd.Timestamp.now().floor('min') - pd.Timedelta(days=window[1])
+        
+        def build_trend_chart():
+            # Only timestamps and scores are read back for ranges beyond the in-memory window
+            if window is not None and window[0] == 'records':
+                trend_df = view.last(window[1])
+            else:
+                trend_df = st.session_state.interview_history.scores_between(since=trend_since)
+            return create_performance_chart(trend_df, max_points=None if full_resolution else TREND_MAX_POINTS)
+        
+        fig = figures.get(version, 'performance', build_trend_chart, window=trend_window, since=trend_since,
+                          full=full_resolution)
         st.plotly_chart(fig, use_container_width=True)
         
         # Skills breakdown
@@ -701,37 +789,43 @@ with tab2:
         
         with col1:
             st.subheader("🎯 Skills by Round")
-            round_performance = df.groupby('round')['overall_score'].mean().reset_index()
-            fig_rounds = px.bar(round_performance, x='round', y='overall_score', 
-                              title="Average Performance by Interview Round")
+            fig_rounds = figures.get(version, 'rounds', lambda: px.bar(
+                pd.DataFrame(sorted(stats.means('round').items()), columns=['round', 'overall_score']),
+                x='round', y='overall_score', title="Average Performance by Interview Round"))
             st.plotly_chart(fig_rounds, use_container_width=True)
         
         with col2:
             st.subheader("📈 Score Distribution")
-            fig_hist = px.histogram(df, x='overall_score', nbins=10, 
-                                  title="Score Distribution")
+            # Every recorded score, not just the in-memory window
+            fig_hist = figures.get(version, 'distribution', lambda: px.histogram(
+                st.session_state.interview_history.scores_between(), x='overall_score', nbins=10,
+                title="Score Distribution"))
             st.plotly_chart(fig_hist, use_container_width=True)
         
         # Recent interview history
         st.subheader("📋 Recent Interview History")
-        recent_df = df[['timestamp', 'role', 'round', 'overall_score', 'answer_length']].tail(10)
-        recent_df['timestamp'] = recent_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
-        st.dataframe(recent_df, use_container_width=True)
+        recent_df = view.last(10)[['date_time', 'role', 'round', 'overall_score', 'answer_length', 'evaluator']]
+        st.dataframe(recent_df.rename(columns={'date_time': 'timestamp'}), hide_index=True, use_container_width=True)
+        heuristic_count = stats.counts('evaluator').get('heuristic', 0)
+        if heuristic_count:
+            st.caption(f"⚠️ {heuristic_count} of {stats.overall.count} scores came from the local heuristic scorer "
+                       f"because the AI evaluation was unavailable")
         
         # Question type analysis
         st.subheader("🎯 Question Type Analysis")
-        if 'question_type' in df.columns:
-            question_type_counts = df['question_type'].value_counts()
-            fig_types = px.pie(values=question_type_counts.values, names=question_type_counts.index,
-                             title="Question Types Distribution")
+        question_type_counts = stats.counts('question_type')
+        if question_type_counts:
+            fig_types = figures.get(version, 'question_types', lambda: px.pie(
+                values=list(question_type_counts.values()), names=list(question_type_counts.keys()),
+                title="Question Types Distribution"))
             st.plotly_chart(fig_types, use_container_width=True)
         
         # Company-specific performance
-        if 'company' in df.columns and df['company'].nunique() > 1:
+        if len(stats.buckets['company']) > 1:
             st.subheader("🏢 Company-Specific Performance")
-            company_performance = df.groupby('company')['overall_score'].mean().reset_index()
-            fig_company = px.bar(company_performance, x='company', y='overall_score',
-                               title="Average Performance by Company")
+            fig_company = figures.get(version, 'companies', lambda: px.bar(
+                pd.DataFrame(sorted(stats.means('company').items()), columns=['company', 'overall_score']),
+                x='company', y='overall_score', title="Average Performance by Company"))
             st.plotly_chart(fig_company, use_container_width=True)
     
     else:
@@ -741,22 +835,23 @@ with tab3:
     st.header("📊 Industry Benchmarks Comparison")
     
     if st.session_state.interview_history:
-        df = pd.DataFrame(st.session_state.interview_history)
-        latest_interview = df.iloc[-1]
+        latest_scores = st.session_state.interview_history.latest_scores()
         
         # Role selection for benchmark
         benchmark_role = st.selectbox("Select Role for Benchmark", ["sde", "ml", "cloud"])
         
         # Radar chart comparison
         st.subheader("🎯 Skills Radar - You vs Industry")
-        fig_radar = create_skills_radar_chart(latest_interview['scores'], benchmark_role)
+        fig_radar = st.session_state.figure_cache.get(
+            st.session_state.interview_history.version, 'radar',
+            lambda: create_skills_radar_chart(latest_scores, benchmark_role), role=benchmark_role)
         st.plotly_chart(fig_radar, use_container_width=True)
         
         # Detailed comparison table
         st.subheader("📋 Detailed Skills Comparison")
         
         comparison_data = []
-        for skill, your_score in latest_interview['scores'].items():
+        for skill, your_score in latest_scores.items():
             benchmark_score = INDUSTRY_BENCHMARKS[benchmark_role][skill]
             gap = your_score - benchmark_score
             
@@ -773,7 +868,7 @@ with tab3:
         
         # Performance percentile
         st.subheader("📊 Your Performance Percentile")
-        your_avg = df['overall_score'].mean()
+        your_avg = st.session_state.interview_history.aggregates.overall.mean
         benchmark_avg = INDUSTRY_BENCHMARKS[benchmark_role]['overall']
         
         if your_avg > benchmark_avg:
@@ -801,15 +896,19 @@ with tab4:
             st.write("• Skills analysis")
             st.write("• Benchmark comparisons")
             
+            export_formats = ['Excel', 'CSV'] + (['Parquet'] if reports.PARQUET_AVAILABLE else [])
+            export_format = st.radio("Format", export_formats, horizontal=True)
+            
             if st.button("📥 Download Excel Report", use_container_width=True):
-                df = pd.DataFrame(st.session_state.interview_history)
-                excel_data = export_to_excel(df)
+                extension, mime = EXPORT_FILE_TYPES[export_format]
+                with export_history(st.session_state.interview_history, export_format) as export_file:
+                    export_data = export_file.read()
                 
                 st.download_button(
-                    label="💾 Download Excel File",
-                    data=excel_data,
-                    file_name=f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    label=f"💾 Download {export_format} File",
+                    data=export_data,
+                    file_name=f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                    mime=mime
                 )
         
         with col2:
@@ -820,14 +919,20 @@ with tab4:
             st.write("• Skills assessment")
             st.write("• Recommendations")
             
+            full_report = st.checkbox("Include full interview history", value=True)
+            report_formats = ['HTML'] + (['PDF'] if reports.PDF_AVAILABLE else [])
+            report_format = st.radio("Report format", report_formats, horizontal=True)
+            
             if st.button("📥 Generate PDF Report", use_container_width=True):
-                html_report = generate_pdf_report()
+                pdf = report_format == 'PDF'
+                with generate_pdf_report(st.session_state.interview_history, recent=None if full_report else 10, pdf=pdf) as report_file:
+                    report_data = report_file.read()
                 
                 st.download_button(
-                    label="💾 Download HTML Report (Print to PDF)",
-                    data=html_report,
-                    file_name=f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
-                    mime="text/html"
+                    label="💾 Download PDF Report" if pdf else "💾 Download HTML Report (Print to PDF)",
+                    data=report_data,
+                    file_name=f"interview_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{'pdf' if pdf else 'html'}",
+                    mime="application/pdf" if pdf else "text/html"
                 )
         
         # Report customization
@@ -836,7 +941,7 @@ with tab4:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            date_range = st.selectbox("Date Range", ["Last 7 days", "Last 30 days", "All time"])
+            date_range = st.selectbox("Date Range", list(REPORT_DATE_RANGES))
         
         with col2:
             include_details = st.checkbox("Include Question Details", value=True)
@@ -847,15 +952,12 @@ with tab4:
         # Preview section
         st.subheader("👀 Report Preview")
         
-        df = pd.DataFrame(st.session_state.interview_history)
-        
-        # Filter by date range
-        if date_range == "Last 7 days":
-            cutoff_date = datetime.now() - timedelta(days=7)
-            df = df[df['timestamp'] >= cutoff_date]
-        elif date_range == "Last 30 days":
-            cutoff_date = datetime.now() - timedelta(days=30)
-            df = df[df['timestamp'] >= cutoff_date]
+        # Filter by date range (binary search over the time-indexed view); the start is floored to the minute
+        # so reruns reuse the history's cached frame when the range reaches past the in-memory window
+        range_days = REPORT_DATE_RANGES[date_range]
+        df = st.session_state.interview_history.columns_between(
+            ['role', 'round', 'overall_score'],
+            since=pd.Timestamp.now().floor('min') - pd.Timedelta(days=range_days) if range_days else None)
         
         if len(df) > 0:
             st.write(f"**Report will include {len(df)} interviews**")
@@ -871,9 +973,8 @@ with tab4:
             
             # Sample data preview
             st.write("**Sample Data Preview:**")
-            preview_df = df[['timestamp', 'role', 'round', 'overall_score']].head(5)
-            preview_df['timestamp'] = preview_df['timestamp'].dt.strftime('%Y-%m-%d')
-            st.dataframe(preview_df, use_container_width=True)
+            preview_df = df.head(5).assign(timestamp=lambda frame: frame['timestamp'].dt.strftime('%Y-%m-%d'))
+            st.dataframe(preview_df, hide_index=True, use_container_width=True)
         else:
             st.warning("No interviews found in the selected date range")
     
@@ -905,32 +1006,45 @@ if st.session_state.follow_up_questions:
 st.sidebar.header("📊 Quick Stats")
 
 if st.session_state.interview_history:
-    df = pd.DataFrame(st.session_state.interview_history)
+    stats = st.session_state.interview_history.aggregates
     
-    st.sidebar.metric("Total Interviews", len(df))
-    st.sidebar.metric("Average Score", f"{df['overall_score'].mean():.1f}/10")
+    st.sidebar.metric("Total Interviews", stats.overall.count)
+    st.sidebar.metric("Average Score", f"{stats.overall.mean:.1f}/10")
     
     # Recent performance
-    if len(df) >= 3:
-        recent_avg = df.tail(3)['overall_score'].mean()
-        overall_avg = df['overall_score'].mean()
-        trend = "📈" if recent_avg > overall_avg else "📉"
+    if stats.overall.recent_count >= 3:
+        recent_avg = stats.overall.recent_mean
+        trend = "📈" if recent_avg > stats.overall.mean else "📉"
         st.sidebar.metric("Recent Trend", f"{trend} {recent_avg:.1f}")
     
     # Best performing round
-    if len(df) > 0:
-        best_round = df.groupby('round')['overall_score'].mean().idxmax()
+    best_round = stats.best('round')
+    if best_round:
         st.sidebar.metric("Best Round", best_round.title())
 
 else:
     st.sidebar.info("No interview data yet")
 
+# Evaluation cache counters (shared by every session in this process)
+cache_stats = get_evaluation_cache().stats()
+with st.sidebar.expander("🗄️ Evaluation Cache"):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Hits", cache_stats['hits'])
+    col2.metric("Misses", cache_stats['misses'])
+    col3.metric("Evictions", cache_stats['evictions'])
+    if 'memory_hits' in cache_stats:
+        st.caption(f"Memory hits: {cache_stats['memory_hits']} · Disk hits: {cache_stats['disk_hits']} · "
+                   f"Stored: {cache_stats['size']}")
+
 # Session Management
 st.sidebar.markdown("---")
 st.sidebar.header("🎛️ Session Controls")
 
 if st.sidebar.button("🔄 Reset All Data"):
-    st.session_state.interview_history = []
+    # Only deletes this session's profile
+    st.session_state.interview_history.clear()
+    st.session_state.figure_cache.clear()
+    drop_evaluation_job()
     st.rerun()
 
 if st.sidebar.button("🤖 Test AI Connection"):
@@ -951,4 +1065,27 @@ if st.sidebar.button("🧹 Clear Smart Settings"):
 
 # Footer
 st.markdown("---")
-st.markdown("*📊 AI Interview Engine with Advanced Analytics - Track, analyze, and improve your interview performance*")
\ No newline at end of file
+st.markdown("*📊 AI Interview Engine with Advanced Analytics - Track, analyze, and improve your interview performance*")
+
+# Stream pending evaluation results into the Interview tab as they land
+if evaluation_slots is not None and not st.session_state.evaluation_job.done:
+    history_version = st.session_state.interview_history.version
+    evaluation_slots['status'].info("🤖 AI is evaluating your response...")
+    # Wait in short slices: Streamlit only stops a run for a click at its next st.* call, so one long
+    # wait here would hold every click until the evaluation finished
+    for name, field in st.session_state.evaluation_job.iter_updates(timeout=EVALUATION_POLL_INTERVAL):
+        if field is None:
+            render_evaluation_result(st.session_state.evaluation_job, name, evaluation_slots)
+        else:
+            render_evaluation_progress(st.session_state.evaluation_job, name, evaluation_slots)
+    
+    if st.session_state.interview_history.version != history_version:
+        # Refresh analytics and sidebar with the new record
+        st.rerun()
+    elif not st.session_state.evaluation_job.done:
+        job = st.session_state.evaluation_job
+        if time.monotonic() - job.started >= EVALUATION_TIMEOUT:
+            # Out of time: stop the job and score locally, so the result replaces the banner
+            job.expire({'evaluation': lambda: fallback_evaluation(job.context['question'], job.context['answer'],
+                                                                  job.context['round'])})
+        st.rerun()
\ No newline at end of file
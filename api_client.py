@@ -0,0 +1,148 @@
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool tuning (override via environment)
+POOL_CONNECTIONS = int(os.environ.get('INTERVIEW_API_POOL_CONNECTIONS', 4))
+POOL_MAXSIZE = int(os.environ.get('INTERVIEW_API_POOL_MAXSIZE', 16))
+MAX_RETRIES = int(os.environ.get('INTERVIEW_API_MAX_RETRIES', 2))
+BACKOFF_FACTOR = float(os.environ.get('INTERVIEW_API_BACKOFF_FACTOR', 0.3))
+BACKOFF_JITTER = float(os.environ.get('INTERVIEW_API_BACKOFF_JITTER', 0.3))
+
+# Read timeout for model-backed calls: past the API Gateway's 29s integration timeout, so the
+# gateway answers (a 429 from the Lambda's deadline, or its own 504) before the client gives up
+MODEL_TIMEOUT = float(os.environ.get('INTERVIEW_API_MODEL_TIMEOUT', 35))
+
+# Only a 503 says the request was not processed. A 500/502, a 504 (the Lambda keeps running after
+# the gateway times out) or a read timeout may already have paid for model calls
+RETRY_STATUSES = (503,)
+
+# How long the server's evaluation prompt version is trusted before /config is asked again
+PROMPT_VERSION_TTL = float(os.environ.get('INTERVIEW_API_PROMPT_VERSION_TTL', 300))
+PROMPT_VERSION_RETRY = 30  # Wait before asking again after a failed lookup
+
+_session = None
+_session_lock = threading.Lock()
+_prompt_versions = {}
+_prompt_versions_lock = threading.Lock()
+
+
+class JitteredRetry(Retry):
+    """Retry policy that adds random jitter to the exponential backoff"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, BACKOFF_JITTER)
+
+
+def build_session(pool_connections=None, pool_maxsize=None, max_retries=None):
+    """Create a requests session with pooled keep-alive connections and retries"""
+    retry = JitteredRetry(
+        total=MAX_RETRIES if max_retries is None else max_retries,
+        connect=MAX_RETRIES if max_retries is None else max_retries,
+        read=0,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'POST']),
+        backoff_factor=BACKOFF_FACTOR,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def get_session():
+    """Return the process-wide API session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def reset_session():
+    """Close the shared session so the next call builds a fresh pool"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def post_json(url, payload, timeout=10):
+    """POST a JSON payload over the shared pooled session"""
+    return get_session().post(url, json=payload, timeout=timeout)
+
+
+def get_json(url, timeout=10):
+    """GET a URL over the shared pooled session"""
+    return get_session().get(url, timeout=timeout)
+
+
+def prompt_version(api_url):
+    """Evaluation prompt version of the server at api_url, or None while it cannot be fetched
+
+    Read from GET {api_url}/config and kept for PROMPT_VERSION_TTL seconds;
+    evaluation responses refresh it through note_prompt_version.
+    """
+    now = time.monotonic()
+    with _prompt_versions_lock:
+        entry = _prompt_versions.get(api_url)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    try:
+        response = get_json(f"{api_url}/config", timeout=5)
+        version = response.json().get('prompt_version') if response.status_code == 200 else None
+    except Exception:
+        # An unreachable or older server only turns caching off; it must not fail the caller
+        version = None
+    with _prompt_versions_lock:
+        _prompt_versions[api_url] = (version, now + (PROMPT_VERSION_TTL if version else PROMPT_VERSION_RETRY))
+    return version
+
+
+def note_prompt_version(api_url, response):
+    """Record the X-Prompt-Version an evaluation response from api_url was produced with"""
+    version = response.headers.get('X-Prompt-Version')
+    if version:
+        with _prompt_versions_lock:
+            _prompt_versions[api_url] = (version, time.monotonic() + PROMPT_VERSION_TTL)
+
+
+def stream_events(url, payload, timeout=10):
+    """POST a JSON payload and yield (event, data) pairs from a server-sent event stream"""
+    headers = {'Accept': 'text/event-stream'}
+    with get_session().post(url, json=payload, timeout=timeout, stream=True, headers=headers) as response:
+        response.raise_for_status()
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+
+        event, data_lines = 'message', []
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:'):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                yield event, json.loads('\n'.join(data_lines))
+                event, data_lines = 'message', []
+        if data_lines:
+            yield event, json.loads('\n'.join(data_lines))
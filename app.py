@@ -1,28 +1,13 @@
 from flask import Flask, render_template_string, request, jsonify
 import json
-import random
 import os
+from question_bank import BANK, SamplerRegistry
+import heuristic_scorer
 
 app = Flask(__name__)
 
-# Mock data for questions
-ROLE_QUESTIONS = {
-    'sde': {
-        'technical': ["Design a URL shortener like bit.ly", "Implement rate limiting", "System design for chat app"],
-        'hr': ["Why software engineering?", "Describe your coding journey", "How do you debug complex issues?"],
-        'managerial': ["How would you mentor junior developers?", "Prioritize features with tight deadlines", "Handle technical debt"]
-    },
-    'ml': {
-        'technical': ["Build recommendation system", "Handle imbalanced datasets", "Deploy ML model at scale"],
-        'hr': ["Why machine learning?", "Explain ML to non-technical person", "Stay updated with ML trends"],
-        'managerial': ["Lead ML team", "Choose between model accuracy vs speed", "Manage ML project timeline"]
-    },
-    'cloud': {
-        'technical': ["Design multi-region architecture", "Implement auto-scaling", "Cost optimization strategies"],
-        'hr': ["Why cloud computing?", "Explain cloud benefits to client", "Handle cloud migration challenges"],
-        'managerial': ["Lead cloud transformation", "Balance security vs accessibility", "Manage cloud budget"]
-    }
-}
+# Per-client question cursors over the shared bank
+question_samplers = SamplerRegistry(BANK)
 
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -81,6 +66,7 @@ HTML_TEMPLATE = '''
 
     <script>
         let currentQuestion = '';
+        const sessionId = Math.random().toString(36).slice(2) + Date.now().toString(36);
 
         function getQuestion() {
             const role = document.getElementById('role').value;
@@ -89,7 +75,7 @@ HTML_TEMPLATE = '''
             fetch('/api/question', {
                 method: 'POST',
                 headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({role, round})
+                body: JSON.stringify({role, round, session_id: sessionId})
             })
             .then(response => response.json())
             .then(data => {
@@ -114,7 +100,7 @@ HTML_TEMPLATE = '''
             fetch('/api/evaluate', {
                 method: 'POST',
                 headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({question: currentQuestion, answer})
+                body: JSON.stringify({question: currentQuestion, answer, round: document.getElementById('round').value})
             })
             .then(response => response.json())
             .then(data => {
@@ -144,8 +130,8 @@ def get_question():
         role = data.get('role', 'sde')
         round_type = data.get('round', 'technical')
         
-        questions = ROLE_QUESTIONS.get(role, {}).get(round_type, ["Tell me about yourself"])
-        question = random.choice(questions)
+        sampler = question_samplers.get(data.get('session_id', request.remote_addr))
+        question = sampler.next(role=role, round=round_type, default="Tell me about yourself")
         
         return jsonify({'question': question})
     except Exception as e:
@@ -154,20 +140,10 @@ def get_question():
 @app.route('/api/evaluate', methods=['POST'])
 def evaluate():
     try:
-        scores = {
-            'technical_accuracy': random.randint(6, 10),
-            'clarity': random.randint(6, 10),
-            'confidence': random.randint(5, 9),
-            'communication': random.randint(6, 10),
-            'relevance': random.randint(7, 10)
-        }
-        
-        overall = round(sum(scores.values()) / 5, 1)
+        data = request.json or {}
+        evaluation = heuristic_scorer.score_answer(data.get('question', ''), data.get('answer', ''), data.get('round'))
         
-        return jsonify({
-            'overall_score': overall,
-            'feedback': f'Good answer! Score: {overall}/10. Consider adding more specific examples.'
-        })
+        return jsonify(evaluation)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,92 @@
+"""Cold-start report for the Lambda handler module
+
+Runs ``python -X importtime`` in fresh interpreters to measure what
+importing lambda_function costs, then times the first Bedrock client
+construction (deferred to the first model call) separately.
+
+    python benchmark_cold_start.py [--runs 5] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CLIENT_SNIPPET = """
+import time
+start = time.perf_counter()
+import lambda_function
+imported = time.perf_counter()
+lambda_function.get_bedrock_client()
+built = time.perf_counter()
+print(f"{(imported - start) * 1e6:.0f} {(built - imported) * 1e6:.0f}")
+"""
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_importtime():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import lambda_function'],
+        cwd=HERE, capture_output=True, text=True, env=dict(os.environ, AWS_DEFAULT_REGION='us-east-1')
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    return parse_importtime(result.stderr)
+
+
+def run_client_construction():
+    result = subprocess.run(
+        [sys.executable, '-c', CLIENT_SNIPPET],
+        cwd=HERE, capture_output=True, text=True, env=dict(os.environ, AWS_DEFAULT_REGION='us-east-1')
+    )
+    if result.returncode != 0:
+        return None
+    import_us, client_us = result.stdout.split()
+    return int(import_us), int(client_us)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    samples = [run_importtime() for _ in range(args.runs)]
+    totals = [modules['lambda_function'][1] for modules in samples]
+    print(f"import lambda_function: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+
+    heavy = 'botocore' in samples[0] or 'boto3' in samples[0]
+    print(f"boto3/botocore imported at module load: {'yes' if heavy else 'no'}")
+
+    print(f"\nTop {args.top} imports by cumulative time (median, ms):")
+    names = set.intersection(*(set(modules) for modules in samples))
+    ranked = sorted(
+        ((statistics.median(modules[name][1] for modules in samples), name) for name in names),
+        reverse=True
+    )
+    for cumulative_us, name in ranked[:args.top]:
+        print(f"  {cumulative_us / 1000:8.2f}  {name}")
+
+    construction = [run_client_construction() for _ in range(args.runs)]
+    construction = [sample for sample in construction if sample]
+    if construction:
+        client_ms = statistics.median(sample[1] for sample in construction) / 1000
+        print(f"\nFirst get_bedrock_client() call (boto3 import + client build): median {client_ms:.1f} ms")
+    else:
+        print("\nget_bedrock_client() could not be timed (is boto3 installed?)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Offline load test of the Lambda pipeline against the fake model provider
+
+Drives lambda_handler from a thread pool with the fake provider on every
+route, so question pooling, caching, coalescing, rate limiting and parsing
+are exercised at high QPS without AWS. Latency and failure rates of the
+fake model are configurable.
+
+    python benchmark_pipeline.py [--requests 2000] [--concurrency 32] [--latency-ms 50]
+        [--throttle-rate 0.02] [--distinct 500] [--rate 1000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+ROUTES = ('/question', '/evaluate', '/evaluate/stream', '/evaluate/batch')
+
+
+class FakeContext:
+    """Stands in for the Lambda context; every invocation starts with the full timeout"""
+
+    def __init__(self, timeout_ms):
+        self.timeout_ms = timeout_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.timeout_ms
+
+
+def configure(args):
+    # Read at import time by lambda_function and its modules, so set before importing them
+    os.environ.update(
+        MODEL_PROVIDER='fake',
+        QUESTION_MODEL_PROVIDER='fake',
+        EVALUATION_MODEL_PROVIDER='fake',
+        FAKE_MODEL_LATENCY_MS=str(args.latency_ms),
+        FAKE_MODEL_LATENCY_SIGMA=str(args.latency_sigma),
+        FAKE_MODEL_ERROR_RATE=str(args.error_rate),
+        FAKE_MODEL_THROTTLE_RATE=str(args.throttle_rate),
+        FAKE_MODEL_SEED=str(args.seed),
+        MODEL_RATE_LIMITS=json.dumps({'fake': [args.rate, args.rate]}),
+        EVALUATION_CACHE_BACKEND=args.cache
+    )
+    sys.path.insert(0, HERE)
+
+
+def build_events(args):
+    from question_bank import BANK
+
+    questions = [question['text'] for question in BANK.questions]
+    routes = args.routes.split(',')
+    events = []
+    for i in range(args.requests):
+        route = routes[i % len(routes)]
+        n = i % args.distinct
+        question = questions[n % len(questions)]
+        # Restating the question keeps answers past the local prescreen, so they reach the model
+        item = {'question': question, 'answer': f"{question} In my last role I handled this case {n} by measuring first."}
+        if route == '/question':
+            body = {'difficulty': 'medium', 'category': ('technical', 'hr', 'behavioral')[n % 3]}
+        elif route == '/evaluate/batch':
+            body = {'items': [item, dict(item, answer=item['answer'] + ' Then I iterated.')]}
+        else:
+            body = item
+        events.append({'path': route, 'body': json.dumps(body)})
+    return events
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--routes', default=','.join(ROUTES), help='comma-separated routes, used round-robin')
+    parser.add_argument('--distinct', type=int, default=1000, help='distinct answers (repeats hit the cache)')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--latency-sigma', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    parser.add_argument('--rate', type=float, default=1000, help='token bucket rate and burst for the fake model')
+    parser.add_argument('--cache', default='memory', help="evaluation cache backend ('none' to disable)")
+    parser.add_argument('--timeout-ms', type=int, default=29000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure(args)
+    import lambda_function
+    from rate_limiter import get_throttle
+
+    events = build_events(args)
+    context = FakeContext(args.timeout_ms)
+
+    def invoke(event):
+        start = time.perf_counter()
+        try:
+            status = lambda_function.lambda_handler(event, context)['statusCode']
+        except Exception as e:
+            status = type(e).__name__
+        return event['path'], status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(invoke, events))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s), "
+          f"concurrency {args.concurrency}, fake latency {args.latency_ms:g} ms")
+    print(f"\n{'route':<18}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  statuses")
+    for route in sorted({route for route, _, _ in results}):
+        latencies = sorted(latency * 1000 for path, _, latency in results if path == route)
+        statuses = Counter(status for path, status, _ in results if path == route)
+        print(f"{route:<18}{len(latencies):>7}{statistics.median(latencies):>9.1f}"
+              f"{percentile(latencies, 0.95):>9.1f}{percentile(latencies, 0.99):>9.1f}  {dict(statuses)}")
+
+    print(f"\nmodel calls: question {lambda_function.question_model.calls}, "
+          f"evaluation {lambda_function.evaluation_model.calls}")
+    print(f"rate limiter: {get_throttle('fake').stats()}")
+    print(f"evaluation cache: {lambda_function.evaluation_cache.stats()}")
+    print(f"coalesced: question {lambda_function.question_flight.stats()}, "
+          f"evaluation {lambda_function.evaluation_flight.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Cache configuration (override via environment)
+CACHE_BACKEND = os.environ.get('EVALUATION_CACHE_BACKEND', 'memory')
+CACHE_PATH = os.environ.get('EVALUATION_CACHE_PATH', '/tmp/evaluation_cache.sqlite3')
+CACHE_TTL = float(os.environ.get('EVALUATION_CACHE_TTL', 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.environ.get('EVALUATION_CACHE_MAX_ENTRIES', 2048))
+MEMORY_TIER_ENTRIES = int(os.environ.get('EVALUATION_CACHE_MEMORY_ENTRIES', 256))
+MEMORY_TIER_TTL = float(os.environ.get('EVALUATION_CACHE_MEMORY_TTL', 3600))
+ACCESS_BATCH_SIZE = int(os.environ.get('EVALUATION_CACHE_ACCESS_BATCH', 64))
+
+_WHITESPACE = re.compile(r'\s+')
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def normalize_text(text):
+    """Case-fold and collapse whitespace so trivially different submissions share a key"""
+    return _WHITESPACE.sub(' ', str(text)).strip().casefold()
+
+
+def make_key(question, answer, prompt_version):
+    """Content-addressed cache key for a (question, answer, prompt version) triple"""
+    payload = json.dumps([prompt_version, normalize_text(question), normalize_text(answer)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU backend with per-entry expiry"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """SQLite file backend standing in for a shared store across processes
+
+    Reads are plain SELECTs: access times for eviction are collected in
+    memory and written in one statement on the next set(), or once
+    ``ACCESS_BATCH_SIZE`` hits are pending.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, clock=time.time):
+        import sqlite3
+
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self._accessed = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS evaluation_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS evaluation_cache_accessed ON evaluation_cache (accessed_at)'
+        )
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM evaluation_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute('DELETE FROM evaluation_cache WHERE key = ?', (key,))
+                self.evictions += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_BATCH_SIZE:
+                self._write_accessed()
+        return json.loads(row[0])
+
+    def _write_accessed(self):
+        if not self._accessed:
+            return
+        # One transaction for the whole batch (the connection autocommits otherwise)
+        self._conn.execute('BEGIN')
+        self._conn.executemany(
+            'UPDATE evaluation_cache SET accessed_at = ? WHERE key = ?',
+            [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+        )
+        self._conn.execute('COMMIT')
+        self._accessed.clear()
+
+    def set(self, key, value):
+        now = self.clock()
+        with self._lock:
+            # Eviction below orders by accessed_at, so pending hits are written first
+            self._write_accessed()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO evaluation_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), now + self.ttl, now)
+            )
+            overflow = self._conn.execute('SELECT COUNT(*) FROM evaluation_cache').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    'DELETE FROM evaluation_cache WHERE key IN '
+                    '(SELECT key FROM evaluation_cache ORDER BY accessed_at LIMIT ?)',
+                    (overflow,)
+                )
+                self.evictions += overflow
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute('DELETE FROM evaluation_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute('DELETE FROM evaluation_cache')
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM evaluation_cache').fetchone()[0]
+
+
+class TieredBackend:
+    """Small in-process LRU in front of a shared backend
+
+    Reads try the memory tier first and promote far hits into it; writes go
+    to both tiers, so other processes sharing the far store see them too.
+    """
+
+    def __init__(self, near, far):
+        self.near = near
+        self.far = far
+        self.near_hits = 0
+        self.far_hits = 0
+
+    @property
+    def evictions(self):
+        return self.near.evictions + self.far.evictions
+
+    def get(self, key):
+        value = self.near.get(key)
+        if value is not None:
+            self.near_hits += 1
+            return value
+        value = self.far.get(key)
+        if value is not None:
+            self.far_hits += 1
+            self.near.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.near.set(key, value)
+        self.far.set(key, value)
+
+    def delete(self, key):
+        self.near.delete(key)
+        self.far.delete(key)
+
+    def clear(self):
+        self.near.clear()
+        self.far.clear()
+
+    def __len__(self):
+        return len(self.far)
+
+
+class EvaluationCache:
+    """Evaluation results keyed on normalized question, answer and prompt version"""
+
+    def __init__(self, backend, prompt_version):
+        self.backend = backend
+        self.prompt_version = prompt_version
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, question, answer):
+        value = self.backend.get(make_key(question, answer, self.prompt_version))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, question, answer, evaluation):
+        self.backend.set(make_key(question, answer, self.prompt_version), evaluation)
+
+    def stats(self):
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.backend.evictions,
+            'size': len(self.backend)
+        }
+        if isinstance(self.backend, TieredBackend):
+            stats.update(memory_hits=self.backend.near_hits, disk_hits=self.backend.far_hits)
+        return stats
+
+
+class NullCache:
+    """Cache stand-in used when caching is disabled"""
+
+    hits = misses = 0
+
+    def get(self, question, answer):
+        return None
+
+    def set(self, question, answer, evaluation):
+        pass
+
+    def stats(self):
+        return {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+
+
+def build_cache(prompt_version, backend=None, path=CACHE_PATH):
+    """Build the evaluation cache selected by name ('memory', 'sqlite', 'tiered' or 'none')"""
+    backend = backend or CACHE_BACKEND
+    if backend == 'none':
+        return NullCache()
+    if backend == 'sqlite':
+        return EvaluationCache(SQLiteBackend(path), prompt_version)
+    if backend == 'tiered':
+        near = MemoryBackend(max_entries=MEMORY_TIER_ENTRIES, ttl=min(MEMORY_TIER_TTL, CACHE_TTL))
+        return EvaluationCache(TieredBackend(near, SQLiteBackend(path)), prompt_version)
+    if backend == 'memory':
+        return EvaluationCache(MemoryBackend(), prompt_version)
+    raise ValueError(f"Unknown evaluation cache backend: {backend}")
+
+
+def get_shared_cache(prompt_version, backend=None, path=CACHE_PATH):
+    """Return the process-wide cache for these settings, building it on first use"""
+    key = (prompt_version, backend or CACHE_BACKEND, path)
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = build_cache(prompt_version, backend, path)
+        return _shared[key]
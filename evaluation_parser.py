@@ -0,0 +1,234 @@
+import json
+import re
+
+CRITERIA = ('technical_accuracy', 'clarity', 'confidence', 'communication', 'relevance')
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_KEY_SEPARATORS = re.compile(r'[\s-]+')
+
+
+class EvaluationParseError(ValueError):
+    """Model output that does not contain a usable evaluation"""
+
+
+class IncrementalJSONParser:
+    """Single-pass parser that emits top-level fields of a streamed JSON object
+
+    Feed it model output as it arrives; ``feed`` returns the (key, value)
+    pairs whose values completed in that chunk, so a score can be shown as
+    soon as its digits are followed by a delimiter. Text before the opening
+    brace is ignored and everything after the closing brace is dropped.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.complete = False
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_depth = 0
+        self._expect = 'key'
+        self._key = None
+        self._token_start = None
+
+    def feed(self, chunk):
+        """Consume a chunk of text, returning the fields completed by it"""
+        if self.complete or not chunk:
+            return []
+        self._text += chunk
+        emitted = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_depth == 1 and self._token_start is not None:
+                        self._close_string(i, emitted)
+                continue
+
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    self._expect = 'key'
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_depth = self._depth
+                if self._depth == 1 and self._token_start is None and self._expect in ('key', 'value'):
+                    self._token_start = i
+            elif ch in '{[':
+                if self._depth == 1 and self._expect == 'value' and self._token_start is None:
+                    self._token_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._token_start is not None:
+                    self._emit(text[self._token_start:i + 1], emitted)
+                elif self._depth == 0:
+                    if self._token_start is not None and self._expect == 'value':
+                        self._emit(text[self._token_start:i], emitted)
+                    self.complete = True
+                    self._pos = i + 1
+                    return emitted
+            elif self._depth == 1:
+                if ch == ':':
+                    self._expect = 'value'
+                elif ch == ',':
+                    if self._token_start is not None and self._expect == 'value':
+                        self._emit(text[self._token_start:i], emitted)
+                    self._expect = 'key'
+                elif not ch.isspace() and self._expect == 'value' and self._token_start is None:
+                    self._token_start = i
+
+        self._pos = len(text)
+        return emitted
+
+    def result(self):
+        """All fields parsed so far"""
+        return dict(self.fields)
+
+    @property
+    def text(self):
+        """Everything fed so far"""
+        return self._text
+
+    def _close_string(self, end, emitted):
+        raw = self._text[self._token_start:end + 1]
+        if self._expect == 'key':
+            self._key = json.loads(raw)
+            self._token_start = None
+        elif self._expect == 'value':
+            self._emit(raw, emitted)
+
+    def _emit(self, raw, emitted):
+        raw = raw.strip()
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        if self._key is not None:
+            self.fields[self._key] = value
+            emitted.append((self._key, value))
+        self._key = None
+        self._token_start = None
+        self._expect = 'done'
+
+
+def iter_json_objects(text):
+    """Yield each JSON object embedded in text, decoded, in order
+
+    Candidates are balanced {...} spans, ignoring braces inside JSON
+    strings (including escaped quotes). When a candidate does not decode,
+    or its brace never closes, the scan restarts at the next '{' after it,
+    so a stray brace in prose cannot swallow the object that follows.
+    """
+    start = text.find('{')
+    while start != -1:
+        end = _balanced_end(text, start)
+        if end is not None:
+            try:
+                value = json.loads(text[start:end])
+            except ValueError:
+                pass
+            else:
+                yield value
+                start = text.find('{', end)
+                continue
+        start = text.find('{', start + 1)
+
+
+def _balanced_end(text, start):
+    # Index just past the brace that closes the one at start, or None if it never closes
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def coerce_score(value):
+    """Score as a number in [1, 10] from 8, 8.5, "8", "8/10" or "8 out of 10"; None when absent"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        match = _NUMBER.search(value)
+        if match is None:
+            return None
+        value = match.group()
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    value = min(max(value, 1.0), 10.0)
+    return int(value) if value.is_integer() else round(value, 1)
+
+
+def validate_evaluation(data):
+    """Normalize a parsed evaluation: five coerced criteria, overall_score, feedback, improved_answer
+
+    Keys are matched case- and separator-insensitively ("Technical Accuracy"
+    counts); a missing overall_score is the criteria mean. Raises
+    EvaluationParseError when any criterion is missing or not a number.
+    """
+    if not isinstance(data, dict):
+        raise EvaluationParseError("Evaluation is not a JSON object")
+    fields = {_KEY_SEPARATORS.sub('_', str(key).strip().lower()): value for key, value in data.items()}
+
+    evaluation = {}
+    invalid = []
+    for name in CRITERIA:
+        score = coerce_score(fields.get(name))
+        if score is None:
+            invalid.append(name)
+        evaluation[name] = score
+    if invalid:
+        raise EvaluationParseError(f"Missing or non-numeric criteria: {', '.join(invalid)}")
+
+    overall = coerce_score(fields.get('overall_score', fields.get('overall')))
+    if overall is None:
+        overall = round(sum(evaluation[name] for name in CRITERIA) / len(CRITERIA), 1)
+    evaluation['overall_score'] = overall
+    evaluation['feedback'] = str(fields.get('feedback') or '')
+    evaluation['improved_answer'] = str(fields.get('improved_answer') or '')
+    return evaluation
+
+
+def parse_evaluation(text):
+    """Extract and validate an evaluation from raw model output
+
+    Every embedded JSON object is tried in order, so a preamble object or a
+    malformed first attempt does not hide a valid evaluation after it.
+    """
+    error = EvaluationParseError("No JSON object found in model output")
+    for data in iter_json_objects(text):
+        try:
+            return validate_evaluation(data)
+        except EvaluationParseError as e:
+            error = e
+    raise error
@@ -0,0 +1,147 @@
+import inspect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from single_flight import SingleFlight
+
+# Background executor sizing (override via environment); shared by every session, at two tasks per
+# submitted answer, and a worker stays busy until its model call returns even after the job is dropped
+MAX_WORKERS = int(os.environ.get('EVALUATION_MAX_WORKERS', 32))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Sessions share this process, so identical answers submitted together share one evaluation request
+evaluation_flight = SingleFlight()
+
+
+def get_executor():
+    """Return the process-wide executor shared by all Streamlit sessions"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='evaluation')
+    return _executor
+
+
+class EvaluationJob:
+    """Concurrently running tasks for one submitted answer
+
+    Tasks run on the background executor and must not touch Streamlit;
+    their results are collected by the script thread as they land. A task
+    that is a generator function streams partial (key, value) updates into
+    ``partials`` and its return value becomes the final result.
+    """
+
+    def __init__(self, tasks, context=None):
+        executor = get_executor()
+        self.context = context or {}
+        self.started = time.monotonic()
+        self.results = {}
+        self.errors = {}
+        self.partials = {name: {} for name in tasks}
+        self.applied = set()
+        self.timed_out = set()
+        self._cancelled = threading.Event()
+        self._updates = queue.Queue()
+        self._futures = {}
+        for name, (fn, args) in tasks.items():
+            self._futures[name] = executor.submit(self._run, name, fn, args)
+
+    @property
+    def done(self):
+        return len(self.results) + len(self.errors) == len(self._futures)
+
+    @property
+    def running(self):
+        """True while any task still holds an executor worker"""
+        return any(not future.done() for future in self._futures.values())
+
+    def _run(self, name, fn, args):
+        try:
+            if not inspect.isgeneratorfunction(fn):
+                return fn(*args)
+            updates = fn(*args)
+            while True:
+                if self._cancelled.is_set():
+                    updates.close()
+                    raise CancelledError(name)
+                try:
+                    key, value = next(updates)
+                except StopIteration as stop:
+                    return stop.value
+                self.partials[name][key] = value
+                self._updates.put((name, key))
+        finally:
+            self._updates.put((name, None))
+
+    def _collect(self, name):
+        if name in self.results or name in self.errors:
+            return None
+        try:
+            self.results[name] = self._futures[name].result()
+        except Exception as e:
+            self.errors[name] = e
+        return name
+
+    def poll(self):
+        """Collect finished tasks without blocking, returning the newly landed names"""
+        landed = []
+        for name, future in self._futures.items():
+            if future.done() and self._collect(name):
+                landed.append(name)
+        return landed
+
+    def iter_updates(self, timeout=None):
+        """Yield (name, key) for each partial update and (name, None) when a task lands
+
+        Waits at most timeout seconds overall.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                name, key = self._updates.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if key is not None:
+                yield name, key
+            elif self._collect(name):
+                yield name, None
+
+    def iter_landed(self, timeout=None):
+        """Yield task names in completion order, waiting at most timeout seconds overall"""
+        for name, key in self.iter_updates(timeout):
+            if key is None:
+                yield name
+
+    def cancel(self):
+        """Cancel tasks that have not started yet and stop streaming tasks at their next update"""
+        self._cancelled.set()
+        for future in self._futures.values():
+            future.cancel()
+
+    def expire(self, fallbacks=None):
+        """Give up on unfinished tasks: cancel them and land fallback results or a TimeoutError
+
+        ``fallbacks`` maps task names to zero-argument callables run on the
+        calling thread. Results that arrive later are ignored.
+        """
+        self.cancel()
+        for name in self._futures:
+            if name in self.results or name in self.errors:
+                continue
+            self.timed_out.add(name)
+            if name in (fallbacks or {}):
+                self.results[name] = fallbacks[name]()
+            else:
+                self.errors[name] = TimeoutError(f"'{name}' did not finish in time")
+
+
+def submit_evaluation(tasks, context=None):
+    """Start evaluation tasks in the background and return their job"""
+    return EvaluationJob(tasks, context)
@@ -0,0 +1,40 @@
+from collections import OrderedDict
+
+MAX_FIGURES = 32
+
+
+class FigureCache:
+    """Bounded LRU of built Plotly figures keyed on (history version, chart type, parameters)
+
+    Figures depend only on the history and their parameters, so a rerun
+    triggered elsewhere in the app serves them from here; a new history
+    version produces new keys and the stale figures age out.
+    """
+
+    def __init__(self, max_entries=MAX_FIGURES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+
+    def get(self, version, chart, build, **params):
+        """Return the cached figure for this key, building it with build() on a miss"""
+        key = (version, chart, tuple(sorted(params.items())))
+        figure = self._figures.get(key)
+        if figure is not None:
+            self._figures.move_to_end(key)
+            self.hits += 1
+            return figure
+
+        self.misses += 1
+        figure = build()
+        self._figures[key] = figure
+        while len(self._figures) > self.max_entries:
+            self._figures.popitem(last=False)
+        return figure
+
+    def clear(self):
+        self._figures.clear()
+
+    def __len__(self):
+        return len(self._figures)
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+
+from term_matcher import compile_terms
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+FOLLOW_UP_RULES_PATH = os.environ.get('FOLLOW_UP_RULES_PATH', os.path.join(DATA_DIR, 'follow_up_rules.json'))
+RECENT_FOLLOW_UPS = int(os.environ.get('FOLLOW_UP_RECENT_WINDOW', 5))
+
+
+class RuleSet:
+    """Follow-up rules for one interview round, compiled into a single matcher
+
+    Each keyword maps to the rules that list it, so one finditer over the
+    answer scores every rule at once: a rule earns its weight (scaled by
+    its per-round weight) for each distinct keyword it matched.
+    """
+
+    def __init__(self, rules, round_name):
+        self.rules = [rule for rule in rules if round_name in rule.get('rounds', (round_name,))]
+        self._weights = [rule.get('weight', 1.0) * rule.get('round_weights', {}).get(round_name, 1.0) for rule in self.rules]
+        self._rules_by_keyword = {}
+        for position, rule in enumerate(self.rules):
+            for keyword in rule['keywords']:
+                self._rules_by_keyword.setdefault(keyword.lower(), []).append(position)
+        self._pattern = compile_terms(self._rules_by_keyword) if self._rules_by_keyword else None
+
+    def score(self, text):
+        """[(score, rule)] for every rule the text triggers, highest score first"""
+        if self._pattern is None:
+            return []
+        keywords = {match.group(1).lower() for match in self._pattern.finditer(text)}
+        scores = {}
+        for keyword in keywords:
+            for position in self._rules_by_keyword[keyword]:
+                scores[position] = scores.get(position, 0.0) + self._weights[position]
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, self.rules[position]) for position, score in ranked]
+
+
+class FollowUpEngine:
+    """Picks follow-up questions from a rule table, skipping recently asked ones"""
+
+    def __init__(self, table):
+        self.rules = table['rules']
+        self.fallbacks = table['fallbacks']
+        self._rule_sets = {}
+        self._lock = threading.Lock()
+
+    def rule_set(self, round_name):
+        with self._lock:
+            if round_name not in self._rule_sets:
+                self._rule_sets[round_name] = RuleSet(self.rules, round_name)
+            return self._rule_sets[round_name]
+
+    def candidates(self, answer, round_name):
+        """Every follow-up the answer supports for this round, best first, then the generic fallbacks"""
+        questions = []
+        for _, rule in self.rule_set(round_name).score(answer):
+            questions.extend(rule['questions'])
+        return questions + self.fallbacks
+
+    def choose(self, answer, round_name, recent=()):
+        """Best follow-up not among the last RECENT_FOLLOW_UPS questions in recent"""
+        recent = set(list(recent)[-RECENT_FOLLOW_UPS:])
+        candidates = self.candidates(answer, round_name)
+        for question in candidates:
+            if question not in recent:
+                return question
+        return candidates[0]
+
+
+def load_rules(path=FOLLOW_UP_RULES_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+_engine = None
+
+
+def get_engine():
+    """Process-wide engine, loaded on first use"""
+    global _engine
+    if _engine is None:
+        _engine = FollowUpEngine(load_rules())
+    return _engine
@@ -0,0 +1,158 @@
+import os
+import re
+
+# Pre-screen limits (override via environment)
+PRESCREEN_MIN_WORDS = int(os.environ.get('PRESCREEN_MIN_WORDS', 5))
+PRESCREEN_OFF_TOPIC_WORDS = int(os.environ.get('PRESCREEN_OFF_TOPIC_WORDS', 30))
+
+CRITERIA = ('technical_accuracy', 'clarity', 'confidence', 'communication', 'relevance')
+STOP_WORDS = frozenset(
+    'a an and are as at be been but by can could did do does for from had has have how i if in into is it its '
+    'me my of on or our so than that the their them then there these they this to was we were what when where '
+    'which who why will with would you your about tell describe explain'.split()
+)
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'+#.-]*")
+_SENTENCE = re.compile(r'[.!?]+(?:\s|$)|\n+')
+_STRUCTURE = re.compile(
+    r'\b(first(?:ly)?|second(?:ly)?|third|then|next|finally|in summary|to summarize|for example|for instance|'
+    r'because|therefore|however|as a result)\b|^\s*(?:[-*•]|\d+[.)])\s',
+    re.IGNORECASE | re.MULTILINE
+)
+_HEDGES = re.compile(r"\b(maybe|perhaps|i think|i guess|not sure|probably|kind of|sort of|i don't know)\b", re.IGNORECASE)
+_OWNERSHIP = re.compile(
+    r'\bi (?:led|built|designed|implemented|decided|owned|drove|created|improved|reduced|delivered|wrote)\b',
+    re.IGNORECASE
+)
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\s*(?:%|percent|x|ms|seconds|minutes|hours|days|weeks|users|requests)?', re.IGNORECASE)
+STAR_PATTERNS = {
+    'situation': re.compile(r'\b(situation|at my (?:previous|last) (?:job|company|role)|when i was|we were facing|context)\b', re.IGNORECASE),
+    'task': re.compile(r'\b(task|goal|my role was|i was responsible|needed to|had to|objective)\b', re.IGNORECASE),
+    'action': _OWNERSHIP,
+    'result': re.compile(r'\b(result|outcome|as a result|which led to|improved|reduced|increased|saved|achieved)\b', re.IGNORECASE),
+}
+
+
+def content_words(text):
+    """Lower-cased non-stop-word tokens with a plural 's' stripped"""
+    words = set()
+    for word in _WORD.findall(text.lower()):
+        word = word.rstrip('.')
+        if word and word not in STOP_WORDS:
+            words.add(word[:-1] if len(word) > 3 and word.endswith('s') else word)
+    return words
+
+
+def answer_features(question, answer, round_name=None):
+    """Raw signals the scorer combines: length, structure, keyword coverage, STAR parts"""
+    words = _WORD.findall(answer.lower())
+    sentences = [part for part in _SENTENCE.split(answer) if part and part.strip()]
+    question_terms = content_words(question)
+    answer_terms = content_words(answer)
+    features = {
+        'word_count': len(words),
+        'sentence_count': max(len(sentences), 1 if words else 0),
+        'structure_markers': len(_STRUCTURE.findall(answer)),
+        'hedges': len(_HEDGES.findall(answer)),
+        'ownership': len(_OWNERSHIP.findall(answer)),
+        'numbers': len(_NUMBERS.findall(answer)),
+        'question_terms': len(question_terms),
+        'coverage': len(question_terms & answer_terms) / len(question_terms) if question_terms else 1.0,
+        'vocabulary': len(answer_terms) / len(words) if words else 0.0,
+    }
+    if round_name == 'hr':
+        features['star'] = sum(1 for pattern in STAR_PATTERNS.values() if pattern.search(answer))
+    return features
+
+
+def _clamp(value):
+    return max(1, min(10, round(value)))
+
+
+def score_features(features):
+    """Criterion scores (1-10) from answer_features; deterministic for the same input"""
+    words = features['word_count']
+    if words == 0:
+        return dict.fromkeys(CRITERIA, 1)
+
+    # Length saturates around 150 words; very long answers lose a little clarity
+    length = min(words / 150, 1.0)
+    avg_sentence = words / features['sentence_count']
+    sentence_fit = 1.0 - min(abs(avg_sentence - 18) / 30, 1.0)
+    structure = min(features['structure_markers'] / 3, 1.0)
+    evidence = min((features['numbers'] + features['ownership']) / 3, 1.0)
+    coverage = features['coverage']
+    star = features.get('star')
+
+    scores = {
+        'technical_accuracy': 2 + 4 * length + 2 * coverage + 2 * evidence,
+        'clarity': 3 + 3 * sentence_fit + 2 * structure + 2 * length - (1 if words > 400 else 0),
+        'confidence': 4 + 3 * min(features['ownership'] / 2, 1.0) + 2 * length - min(features['hedges'], 3),
+        'communication': 2 + 3 * length + 3 * structure + 2 * min(features['vocabulary'] * 1.5, 1.0),
+        'relevance': 2 + 6 * coverage + 2 * length,
+    }
+    if star is not None:
+        # Behavioural answers are judged on how much of Situation/Task/Action/Result they cover
+        scores['communication'] = 2 + 2 * length + 6 * star / 4
+        scores['relevance'] = 2 + 3 * coverage + 5 * star / 4
+    return {name: _clamp(value) for name, value in scores.items()}
+
+
+def feedback_for(features, scores):
+    """Short actionable feedback pointing at the weakest signals"""
+    tips = []
+    if features['word_count'] < 50:
+        tips.append("Expand your answer with more detail")
+    if features['coverage'] < 0.3 and features['question_terms']:
+        tips.append("Address the question's key terms directly")
+    if features['structure_markers'] == 0:
+        tips.append("Structure it (e.g. first/then/finally)")
+    if features['numbers'] + features['ownership'] == 0:
+        tips.append("Add a concrete example with measurable results")
+    if features['hedges']:
+        tips.append("Avoid hedging phrases to sound more confident")
+    if features.get('star') is not None and features['star'] < 4:
+        tips.append("Cover all of Situation, Task, Action and Result")
+    overall = sum(scores.values()) / len(scores)
+    opening = "Strong answer." if overall >= 8 else "Solid answer." if overall >= 6 else "Needs work."
+    return opening + (" " + "; ".join(tips) + "." if tips else "")
+
+
+def score_answers(items, round_name=None):
+    """Evaluate a batch of (question, answer) pairs locally; returns evaluation dicts in order
+
+    Each dict has the five criteria, overall_score, feedback and an empty
+    improved_answer, matching the model's evaluation payload.
+    """
+    evaluations = []
+    for question, answer in items:
+        features = answer_features(question, answer, round_name)
+        scores = score_features(features)
+        evaluation = dict(scores)
+        evaluation.update(
+            overall_score=round(sum(scores.values()) / len(scores), 1),
+            feedback=feedback_for(features, scores),
+            improved_answer='',
+            evaluator='heuristic'
+        )
+        evaluations.append(evaluation)
+    return evaluations
+
+
+def score_answer(question, answer, round_name=None):
+    return score_answers([(question, answer)], round_name)[0]
+
+
+def prescreen(question, answer):
+    """Local evaluation for answers not worth a model call, else None
+
+    Only trivially short answers, or short answers sharing no content word
+    with a question that has several, are screened out; anything else goes
+    to the model.
+    """
+    features = answer_features(question, answer)
+    words = features['word_count']
+    off_topic = features['coverage'] == 0 and features['question_terms'] >= 3 and words < PRESCREEN_OFF_TOPIC_WORDS
+    if words >= PRESCREEN_MIN_WORDS and not off_topic:
+        return None
+    return score_answer(question, answer)
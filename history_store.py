@@ -0,0 +1,463 @@
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from running_stats import ScoreAggregates
+
+NUMERIC_FIELDS = {'overall_score': 'd', 'answer_length': 'q', 'duration': 'q'}
+TEXT_FIELDS = ('role', 'round', 'question', 'answer', 'question_type', 'company', 'evaluator')
+AGGREGATE_BUCKETS = ('round', 'company', 'role', 'question_type', 'evaluator')
+SELECTABLE_COLUMNS = frozenset(['timestamp', *TEXT_FIELDS, *NUMERIC_FIELDS])
+MAX_RANGE_FRAMES = 8
+
+# Persistence configuration (override via environment)
+HISTORY_BACKEND = os.environ.get('INTERVIEW_HISTORY_BACKEND', 'sqlite')
+HISTORY_DB_PATH = os.environ.get('INTERVIEW_HISTORY_DB', 'interview_history.sqlite3')
+HISTORY_MEMORY_WINDOW = int(os.environ.get('INTERVIEW_HISTORY_WINDOW', 1000))
+WRITE_BATCH_SIZE = int(os.environ.get('INTERVIEW_HISTORY_BATCH_SIZE', 10))
+WRITE_MAX_DELAY = float(os.environ.get('INTERVIEW_HISTORY_MAX_DELAY', 5))
+DEFAULT_PROFILE = os.environ.get('INTERVIEW_PROFILE', 'default')
+
+
+class InterviewHistory:
+    """Append-only interview history kept in columnar buffers
+
+    Records are split into typed column buffers on append and the nested
+    ``scores`` dict is flattened into one float column per criterion, so
+    the DataFrame view is assembled column-wise and only rebuilt when the
+    history version changes. ``aggregates`` keeps running score stats
+    overall and per round, company, role, question type and evaluator
+    ('model' or 'heuristic').
+
+    With a backend, every record is also persisted and only the newest
+    ``window`` records stay in memory; aggregates still cover everything.
+    """
+
+    def __init__(self, records=(), backend=None, profile=DEFAULT_PROFILE, window=None):
+        self.version = 0
+        self.backend = backend
+        self.profile = profile
+        self.window = window
+        self.aggregates = ScoreAggregates(buckets=AGGREGATE_BUCKETS)
+        self._timestamps = array('q')
+        self._numeric = {name: array(typecode) for name, typecode in NUMERIC_FIELDS.items()}
+        self._text = {name: [] for name in TEXT_FIELDS}
+        self._scores = {}
+        self._frame = None
+        self._frame_version = -1
+        self._view = None
+        self._view_version = -1
+        self._range_frames = {}
+        self._range_version = -1
+        for record in records:
+            self.append(record)
+
+    @classmethod
+    def load(cls, backend, profile=DEFAULT_PROFILE, window=HISTORY_MEMORY_WINDOW):
+        """Rebuild a profile's history from a backend, keeping only the newest window in memory"""
+        history = cls(profile=profile, window=window)
+        for row in backend.iter_aggregate_rows(profile):
+            history._add_aggregates(row)
+        for record in backend.query(profile, newest=window):
+            history._append_columns(record)
+        history.backend = backend
+        history.version += 1
+        return history
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __bool__(self):
+        return len(self._timestamps) > 0
+
+    def append(self, record):
+        """Add one interview record"""
+        self._append_columns(record)
+        self._add_aggregates(record)
+        if self.backend is not None:
+            self.backend.add(self.profile, record)
+        if self.window and len(self) > self.window * 1.25:
+            self._trim(len(self) - self.window)
+        self.version += 1
+
+    def _append_columns(self, record):
+        size = len(self)
+        self._timestamps.append(pd.Timestamp(record['timestamp']).value)
+        for name, column in self._numeric.items():
+            value = record.get(name)
+            if column.typecode == 'd':
+                column.append(math.nan if value is None else float(value))
+            else:
+                column.append(int(value or 0))
+        for name, column in self._text.items():
+            column.append(record.get(name) or '')
+
+        scores = record.get('scores', {})
+        for name in scores:
+            if name not in self._scores:
+                self._scores[name] = array('d', [math.nan]) * size
+        for name, column in self._scores.items():
+            column.append(float(scores.get(name, math.nan)))
+
+    def _add_aggregates(self, record):
+        self.aggregates.add(record['overall_score'], **{name: record.get(name) for name in AGGREGATE_BUCKETS})
+
+    def _trim(self, count):
+        # Runs once per window/4 appends, so dropping the oldest records stays amortized O(1)
+        del self._timestamps[:count]
+        for column in list(self._numeric.values()) + list(self._text.values()) + list(self._scores.values()):
+            del column[:count]
+
+    @property
+    def score_names(self):
+        return list(self._scores)
+
+    def export_columns(self):
+        """Column order shared by the DataFrame view and streamed exports"""
+        return ['timestamp', *TEXT_FIELDS, *NUMERIC_FIELDS, *self._scores]
+
+    def latest_scores(self):
+        """Scores of the most recent record as a {criterion: score} dict"""
+        if not self:
+            return {}
+        return {
+            name: int(value) if value.is_integer() else value
+            for name, value in ((name, column[-1]) for name, column in self._scores.items())
+            if not math.isnan(value)
+        }
+
+    def to_frame(self):
+        """DataFrame view of the in-memory history, cached until the next append"""
+        if self._frame_version != self.version:
+            columns = {'timestamp': pd.to_datetime(np.array(self._timestamps, dtype='int64'))}
+            for name in TEXT_FIELDS:
+                columns[name] = self._text[name]
+            for name, column in self._numeric.items():
+                columns[name] = np.array(column)
+            for name, column in self._scores.items():
+                columns[name] = np.array(column, dtype='float64')
+            self._frame = pd.DataFrame(columns)
+            self._frame_version = self.version
+        return self._frame
+
+    def time_view(self):
+        """TimeIndexedView of the in-memory history, cached until the next append"""
+        if self._view_version != self.version:
+            self._view = TimeIndexedView(self.to_frame())
+            self._view_version = self.version
+        return self._view
+
+    def covers(self, since=None):
+        """Whether the in-memory window holds every record from since onwards"""
+        if self.backend is None or len(self) == self.aggregates.overall.count:
+            return True
+        return since is not None and bool(self) and pd.Timestamp(since).value >= self._timestamps[0]
+
+    def frame_between(self, since=None, until=None):
+        """Time-indexed DataFrame of records in [since, until)
+
+        Served by binary search over the in-memory view when the window
+        covers the range, otherwise read from the backend.
+        """
+        if self.covers(since):
+            return self.time_view().between(since, until)
+        records = self.backend.query(self.profile, since=since, until=until)
+        return TimeIndexedView(InterviewHistory(records).to_frame()).frame
+
+    def columns_between(self, columns, since=None, until=None):
+        """DataFrame of timestamp and the named columns for records in [since, until)
+
+        Outside the in-memory window only those columns are read from the
+        backend, and the frame is kept per (columns, range) until the
+        history version changes, so reruns do not query again.
+        """
+        columns = ['timestamp', *columns]
+        if self.covers(since):
+            return self.time_view().between(since, until)[columns]
+        if self._range_version != self.version:
+            self._range_frames = {}
+            self._range_version = self.version
+        key = (tuple(columns), since, until)
+        if key not in self._range_frames:
+            values = self.backend.select(self.profile, columns, since=since, until=until)
+            frame = {'timestamp': pd.to_datetime(np.array(values['timestamp'], dtype='int64'))}
+            for name in columns[1:]:
+                if name in NUMERIC_FIELDS:
+                    frame[name] = np.array(values[name], dtype='float64' if NUMERIC_FIELDS[name] == 'd' else 'int64')
+                else:
+                    frame[name] = values[name]
+            if len(self._range_frames) >= MAX_RANGE_FRAMES:
+                del self._range_frames[next(iter(self._range_frames))]
+            self._range_frames[key] = pd.DataFrame(frame)
+        return self._range_frames[key]
+
+    def scores_between(self, since=None, until=None):
+        """DataFrame of timestamp and overall_score for records in [since, until), e.g. for trend charts"""
+        return self.columns_between(['overall_score'], since, until)
+
+    def iter_frames(self, chunk_rows=1000, since=None, until=None):
+        """Yield DataFrame chunks of records in [since, until), paging the backend when one is attached"""
+        if self.backend is None:
+            df = self.frame_between(since, until)
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start:start + chunk_rows]
+            return
+        for records in self.backend.iter_chunks(self.profile, since, until, chunk_rows):
+            yield InterviewHistory(records).to_frame()
+
+    def clear(self):
+        """Drop all records, including persisted ones for this profile"""
+        if self.backend is not None:
+            self.backend.delete_profile(self.profile)
+        version = self.version
+        self.__init__(backend=self.backend, profile=self.profile, window=self.window)
+        self.version = version + 1
+
+
+class TimeIndexedView:
+    """History frame on a sorted DatetimeIndex with preformatted timestamp labels
+
+    Range queries are two binary searches plus a positional slice, and the
+    ``date`` / ``date_time`` label columns are formatted once per history
+    version instead of on every preview.
+    """
+
+    def __init__(self, frame):
+        frame = frame.set_axis(pd.DatetimeIndex(frame['timestamp']).rename(None))
+        if not frame.index.is_monotonic_increasing:
+            frame = frame.sort_index(kind='stable')
+        self.frame = frame.assign(
+            date=frame.index.strftime('%Y-%m-%d'),
+            date_time=frame.index.strftime('%Y-%m-%d %H:%M')
+        )
+        self.index = self.frame.index
+
+    def __len__(self):
+        return len(self.frame)
+
+    def between(self, since=None, until=None):
+        """Rows with since <= timestamp < until, located with searchsorted"""
+        start = 0 if since is None else self.index.searchsorted(pd.Timestamp(since), side='left')
+        stop = len(self.index) if until is None else self.index.searchsorted(pd.Timestamp(until), side='left')
+        return self.frame.iloc[start:stop]
+
+    def last(self, count):
+        return self.frame.iloc[-count:] if count else self.frame.iloc[:0]
+
+
+class SQLiteHistoryBackend:
+    """Interview history persisted in a local SQLite database (WAL mode)
+
+    Writes are buffered and flushed in one transaction once ``batch_size``
+    records are pending or, from a background timer, once the oldest
+    pending record is ``max_delay`` seconds old; reads flush first so
+    they always see every record.
+    """
+
+    def __init__(self, path=HISTORY_DB_PATH, batch_size=WRITE_BATCH_SIZE, max_delay=WRITE_MAX_DELAY):
+        import sqlite3
+
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._pending = []
+        self._pending_since = None
+        self._timer = None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS interviews ('
+                'id INTEGER PRIMARY KEY, profile TEXT NOT NULL, timestamp INTEGER NOT NULL, '
+                'role TEXT, round TEXT, question TEXT, answer TEXT, question_type TEXT, company TEXT, '
+                'overall_score REAL, answer_length INTEGER, duration INTEGER, scores TEXT, evaluator TEXT)'
+            )
+            # Databases created before records carried their evaluator
+            if 'evaluator' not in {row[1] for row in self._conn.execute('PRAGMA table_info(interviews)')}:
+                self._conn.execute('ALTER TABLE interviews ADD COLUMN evaluator TEXT')
+            for column in ('timestamp', 'role', 'round', 'company'):
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS interviews_{column} ON interviews (profile, {column})'
+                )
+        atexit.register(self.flush)
+
+    def add(self, profile, record):
+        row = (
+            profile,
+            pd.Timestamp(record['timestamp']).value,
+            *(record.get(name, '') for name in TEXT_FIELDS),
+            record.get('overall_score'),
+            record.get('answer_length', 0),
+            record.get('duration', 0),
+            json.dumps(record.get('scores', {}))
+        )
+        with self._lock:
+            self._pending.append(row)
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+                # No later add() may come to notice the delay, so a timer enforces it
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._pending_since >= self.max_delay:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT INTO interviews (profile, timestamp, role, round, question, answer, question_type, '
+                    'company, evaluator, overall_score, answer_length, duration, scores) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    self._pending
+                )
+            self._pending = []
+            self._pending_since = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def query(self, profile, since=None, until=None, role=None, round=None, company=None, newest=None):
+        """Record dicts in timestamp order, filtered through the (profile, column) indexes"""
+        clauses, params = ['profile = ?'], [profile]
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(pd.Timestamp(since).value)
+        if until is not None:
+            clauses.append('timestamp < ?')
+            params.append(pd.Timestamp(until).value)
+        for name, value in (('role', role), ('round', round), ('company', company)):
+            if value is not None:
+                clauses.append(f'{name} = ?')
+                params.append(value)
+
+        sql = (
+            'SELECT timestamp, role, round, question, answer, question_type, company, evaluator, '
+            'overall_score, answer_length, duration, scores, id FROM interviews WHERE ' + ' AND '.join(clauses)
+        )
+        if newest:
+            sql = f'SELECT * FROM ({sql} ORDER BY timestamp DESC, id DESC LIMIT ?) ORDER BY timestamp, id'
+            params.append(newest)
+        else:
+            sql += ' ORDER BY timestamp, id'
+
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_record(row) for row in rows]
+
+    def iter_chunks(self, profile, since=None, until=None, chunk_rows=1000):
+        """Yield lists of record dicts in timestamp order, at most chunk_rows per list
+
+        Pages with a (timestamp, id) keyset, so each chunk is one indexed
+        range scan and only one chunk is ever held in memory.
+        """
+        start = None if since is None else pd.Timestamp(since).value
+        end = None if until is None else pd.Timestamp(until).value
+        cursor = None
+        while True:
+            clauses, params = ['profile = ?'], [profile]
+            if start is not None:
+                clauses.append('timestamp >= ?')
+                params.append(start)
+            if end is not None:
+                clauses.append('timestamp < ?')
+                params.append(end)
+            if cursor is not None:
+                clauses.append('(timestamp > ? OR (timestamp = ? AND id > ?))')
+                params.extend((cursor[0], cursor[0], cursor[1]))
+            params.append(chunk_rows)
+
+            with self._lock:
+                self.flush()
+                rows = self._conn.execute(
+                    'SELECT timestamp, role, round, question, answer, question_type, company, evaluator, '
+                    'overall_score, answer_length, duration, scores, id FROM interviews WHERE '
+                    + ' AND '.join(clauses) + ' ORDER BY timestamp, id LIMIT ?',
+                    params
+                ).fetchall()
+            if not rows:
+                return
+            yield [_row_record(row) for row in rows]
+            if len(rows) < chunk_rows:
+                return
+            cursor = (rows[-1][0], rows[-1][12])
+
+    def select(self, profile, columns, since=None, until=None):
+        """{column: values} for records in [since, until) in timestamp order, reading only those columns"""
+        unknown = set(columns) - SELECTABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown history columns: {sorted(unknown)}")
+        clauses, params = ['profile = ?'], [profile]
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(pd.Timestamp(since).value)
+        if until is not None:
+            clauses.append('timestamp < ?')
+            params.append(pd.Timestamp(until).value)
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                f'SELECT {", ".join(columns)} FROM interviews WHERE ' + ' AND '.join(clauses)
+                + ' ORDER BY timestamp, id',
+                params
+            ).fetchall()
+        return {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+
+    def iter_aggregate_rows(self, profile):
+        """Yield the fields aggregates need for every record, skipping question and answer text"""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                'SELECT overall_score, round, company, role, question_type, evaluator FROM interviews '
+                'WHERE profile = ? ORDER BY timestamp, id',
+                (profile,)
+            ).fetchall()
+        for overall_score, round_name, company, role, question_type, evaluator in rows:
+            yield {
+                'overall_score': overall_score,
+                'round': round_name,
+                'company': company,
+                'role': role,
+                'question_type': question_type,
+                'evaluator': evaluator
+            }
+
+    def delete_profile(self, profile):
+        with self._lock:
+            self._pending = [row for row in self._pending if row[0] != profile]
+            with self._conn:
+                self._conn.execute('DELETE FROM interviews WHERE profile = ?', (profile,))
+
+
+def _row_record(row):
+    record = dict(zip(TEXT_FIELDS, row[1:8]))
+    record.update(
+        timestamp=pd.Timestamp(row[0]),
+        overall_score=row[8],
+        answer_length=row[9],
+        duration=row[10],
+        scores=json.loads(row[11])
+    )
+    return record
+
+
+def build_backend(name=None):
+    """Build the history backend selected by name ('sqlite' or 'memory')"""
+    name = name or HISTORY_BACKEND
+    if name == 'memory':
+        return None
+    if name == 'sqlite':
+        return SQLiteHistoryBackend()
+    raise ValueError(f"Unknown interview history backend: {name}")
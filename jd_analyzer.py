@@ -0,0 +1,75 @@
+import json
+import os
+from collections import namedtuple
+
+from term_matcher import compile_terms
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SKILL_TAXONOMY_PATH = os.environ.get('SKILL_TAXONOMY_PATH', os.path.join(DATA_DIR, 'skill_taxonomy.json'))
+ROLE_BOOST = float(os.environ.get('SKILL_ROLE_BOOST', 1.5))
+
+SkillMatch = namedtuple('SkillMatch', 'skill category count score')
+
+
+class SkillMatcher:
+    """All taxonomy aliases compiled into one case-insensitive regex
+
+    Aliases only match as whole terms (see compile_terms), and one
+    finditer over the text extracts every skill mention.
+    """
+
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self._skills = {}
+        for skill, entry in taxonomy.items():
+            for alias in entry['aliases']:
+                self._skills[alias.lower()] = skill
+        self._pattern = compile_terms(self._skills)
+
+    def counts(self, text):
+        """{skill: number of mentions} for one pass over text"""
+        counts = {}
+        for match in self._pattern.finditer(text):
+            skill = self._skills[match.group(1).lower()]
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def analyze(self, text, role=None):
+        """SkillMatch list ranked by score (weight x mentions, boosted for the target role)"""
+        matches = []
+        for skill, count in self.counts(text).items():
+            entry = self.taxonomy[skill]
+            score = entry.get('weight', 1.0) * count
+            if role and role in entry.get('roles', ()):
+                score *= ROLE_BOOST
+            matches.append(SkillMatch(skill, entry.get('category', 'technology'), count, score))
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches
+
+
+def load_taxonomy(path=SKILL_TAXONOMY_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+_matcher = None
+
+
+def get_matcher():
+    """Process-wide matcher, compiled on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+def analyze_job_description(job_description, role=None):
+    return get_matcher().analyze(job_description, role)
+
+
+def rank_questions(job_description, role=None):
+    """Questions for the matched skills, technology skills first, each group by score"""
+    matches = analyze_job_description(job_description, role)
+    taxonomy = get_matcher().taxonomy
+    ordered = [m for m in matches if m.category == 'technology'] + [m for m in matches if m.category != 'technology']
+    return [taxonomy[m.skill]['question'] for m in ordered if taxonomy[m.skill].get('question')]
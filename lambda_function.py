@@ -1,33 +1,66 @@
 import json
-import boto3
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from evaluation_cache import build_cache, make_key
+from evaluation_parser import IncrementalJSONParser, EvaluationParseError, parse_evaluation, validate_evaluation
+from question_pool import QuestionPool
+from similarity_index import NearDuplicateIndex, load_signatures
+from heuristic_scorer import prescreen
+from single_flight import SingleFlight
+from rate_limiter import ModelThrottledError, get_throttle
+from model_providers import build_route_provider
 
-bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
+BEDROCK_REGION = os.environ.get('BEDROCK_REGION', 'us-east-1')
 
-def lambda_handler(event, context):
-    path = event.get('path', '')
-    body = json.loads(event.get('body', '{}'))
-    
-    if path == '/question':
-        return generate_question(body)
-    elif path == '/evaluate':
-        return evaluate_answer(body)
-    
-    return {'statusCode': 404, 'body': json.dumps({'error': 'Not found'})}
+# boto3/botocore are imported on first use so cold starts only pay for them when a model is called
+_bedrock = None
+_bedrock_lock = threading.Lock()
 
-def generate_question(data):
-    difficulty = data.get('difficulty', 'easy')
-    category = data.get('category', 'technical')
-    personality = data.get('personality', 'friendly')
-    
-    personalities = {
-        'friendly': 'Ask in a warm, encouraging tone',
-        'strict': 'Ask in a direct, no-nonsense professional manner', 
-        'expert': 'Ask with deep technical expertise and precision'
-    }
-    
-    prompt = f"""
+# Each route picks its own provider and model (MODEL_PROVIDER / QUESTION_MODEL_PROVIDER / EVALUATION_MODEL_PROVIDER)
+question_model = build_route_provider('question', client_factory=lambda: get_bedrock_client())
+evaluation_model = build_route_provider('evaluation', client_factory=lambda: get_bedrock_client())
+
+# Bump whenever the evaluation prompt or model changes so stale scores are not served
+EVALUATION_PROMPT_VERSION = f'{evaluation_model.model_id}/2'
+
+# Survives across warm invocations of the same container
+evaluation_cache = build_cache(EVALUATION_PROMPT_VERSION)
+
+# Batch evaluation limits
+BATCH_MAX_ITEMS = int(os.environ.get('EVALUATION_BATCH_MAX_ITEMS', 50))
+BATCH_CONCURRENCY = int(os.environ.get('EVALUATION_BATCH_CONCURRENCY', 4))
+
+# Generated questions too close to a bank question or an earlier one are regenerated (at most this many times)
+QUESTION_DEDUPE_RETRIES = int(os.environ.get('QUESTION_DEDUPE_RETRIES', 1))
+_question_index = None
+_question_index_lock = threading.Lock()
+
+# Concurrent identical model calls in this container share one upstream request
+question_flight = SingleFlight()
+evaluation_flight = SingleFlight()
+
+# Model calls queue and retry until the request deadline: the smaller of the Lambda's remaining
+# time and the API Gateway integration timeout, less a margin for writing the response
+API_GATEWAY_TIMEOUT = float(os.environ.get('API_GATEWAY_TIMEOUT', 29))
+DEADLINE_MARGIN = float(os.environ.get('DEADLINE_MARGIN', 1))
+BACKGROUND_DEADLINE = float(os.environ.get('BACKGROUND_DEADLINE', 30))
+_request = threading.local()
+
+# Prompt templates and generation configs are built once per container
+DIFFICULTIES = ('easy', 'medium', 'hard')
+CATEGORIES = ('technical', 'hr', 'behavioral', 'managerial')
+PERSONALITIES = {
+    'friendly': 'Ask in a warm, encouraging tone',
+    'strict': 'Ask in a direct, no-nonsense professional manner', 
+    'expert': 'Ask with deep technical expertise and precision'
+}
+
+QUESTION_PROMPT_TEMPLATE = """
     Generate a {difficulty} level {category} interview question.
-    {personalities[personality]}.
+    {personality}.
     
     Categories:
     - Technical: Programming, system design, algorithms
@@ -36,30 +69,10 @@ def generate_question(data):
     
     Return only the question, no extra text.
     """
-    
-    response = bedrock.invoke_model(
-        modelId='amazon.titan-text-express-v1',
-        body=json.dumps({
-            'inputText': prompt,
-            'textGenerationConfig': {
-                'maxTokenCount': 200,
-                'temperature': 0.7
-            }
-        })
-    )
-    
-    result = json.loads(response['body'].read())
-    question = result['results'][0]['outputText'].strip()
-    
-    return {
-        'statusCode': 200,
-        'body': json.dumps({'question': question})
-    }
 
-def evaluate_answer(data):
-    prompt = f"""
-    Question: {data['question']}
-    Answer: {data['answer']}
+EVALUATION_PROMPT_TEMPLATE = """
+    Question: {question}
+    Answer: {answer}
     
     Evaluate this interview answer on 5 criteria (1-10 each):
     1. Technical Accuracy - correctness of information
@@ -85,22 +98,323 @@ def evaluate_answer(data):
         "improved_answer": "..."
     }}
     """
+
+REPAIR_PROMPT_TEMPLATE = """
+    The text below should have been an interview evaluation in JSON but could not be used ({error}).
+    Rewrite it as one JSON object with exactly these keys: technical_accuracy, clarity, confidence,
+    communication, relevance (numbers 1-10), overall_score, feedback, improved_answer.
+    Return only the JSON object.
     
-    response = bedrock.invoke_model(
-        modelId='amazon.titan-text-express-v1',
-        body=json.dumps({
-            'inputText': prompt,
-            'textGenerationConfig': {
-                'maxTokenCount': 500,
-                'temperature': 0.3
-            }
-        })
+    Text: {output}
+    """
+
+# Extra model calls allowed to repair an evaluation that fails to parse
+EVALUATION_REPAIR_ATTEMPTS = int(os.environ.get('EVALUATION_REPAIR_ATTEMPTS', 1))
+
+QUESTION_GENERATION_CONFIG = {'max_tokens': 200, 'temperature': 0.7}
+EVALUATION_GENERATION_CONFIG = {'max_tokens': 500, 'temperature': 0.3}
+
+def get_bedrock_client():
+    global _bedrock
+    if _bedrock is None:
+        with _bedrock_lock:
+            if _bedrock is None:
+                import boto3
+                from botocore.config import Config
+                
+                session = boto3.session.Session()
+                _bedrock = session.client('bedrock-runtime', region_name=BEDROCK_REGION, config=Config(
+                    connect_timeout=5,
+                    read_timeout=60,
+                    max_pool_connections=max(10, BATCH_CONCURRENCY * 2),
+                    # Throttles and transient errors are retried by the rate limiter, which sees the deadline
+                    retries={'max_attempts': 1, 'mode': 'standard'}
+                ))
+    return _bedrock
+
+def lambda_handler(event, context):
+    path = event.get('path', '')
+    body = json.loads(event.get('body') or '{}')
+    set_request_deadline(request_deadline(context))
+    
+    try:
+        if path == '/config':
+            return get_config()
+        elif path == '/question':
+            return generate_question(body)
+        elif path == '/evaluate':
+            return evaluate_answer(body)
+        elif path == '/evaluate/stream':
+            return evaluate_answer_stream(body)
+        elif path == '/evaluate/batch':
+            return evaluate_answers_batch(body)
+    except ModelThrottledError as e:
+        return {
+            'statusCode': 429,
+            'headers': {'Retry-After': str(max(1, math.ceil(e.retry_after)))},
+            'body': json.dumps({'error': str(e)})
+        }
+    finally:
+        set_request_deadline(None)
+    
+    return {'statusCode': 404, 'body': json.dumps({'error': 'Not found'})}
+
+def get_config():
+    # Clients namespace their own evaluation caches by the prompt version, so a new prompt or model
+    # does not keep serving evaluations cached from the old one
+    return {'statusCode': 200, 'body': json.dumps({'prompt_version': EVALUATION_PROMPT_VERSION})}
+
+def request_deadline(context):
+    timeout = API_GATEWAY_TIMEOUT
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        timeout = min(timeout, context.get_remaining_time_in_millis() / 1000)
+    return time.monotonic() + timeout - DEADLINE_MARGIN
+
+def set_request_deadline(deadline):
+    _request.deadline = deadline
+
+def call_model(model, fn):
+    # Pool refill threads have no request, so they get a fixed budget of their own
+    deadline = getattr(_request, 'deadline', None) or time.monotonic() + BACKGROUND_DEADLINE
+    return get_throttle(model.model_id).call(fn, deadline)
+
+def with_deadline(deadline, fn, *args):
+    # Worker threads inherit the deadline of the request that spawned them
+    set_request_deadline(deadline)
+    try:
+        return fn(*args)
+    finally:
+        set_request_deadline(None)
+
+def generate_question(data):
+    difficulty = data.get('difficulty', 'easy')
+    category = data.get('category', 'technical')
+    personality = data.get('personality', 'friendly')
+    
+    # Pool keys come from the client; unknown values would each grow a pool and start a refill
+    if difficulty not in DIFFICULTIES or category not in CATEGORIES or personality not in PERSONALITIES:
+        return {'statusCode': 400, 'body': json.dumps({
+            'error': f'difficulty must be one of {DIFFICULTIES}, category one of {CATEGORIES} '
+                     f'and personality one of {tuple(PERSONALITIES)}'
+        })}
+    
+    # Serve a pre-generated question when one is ready; cold keys fall back to the model
+    key = (difficulty, category, personality)
+    question = question_pool.get(key)
+    source = 'pool'
+    if question is None:
+        source = 'model'
+        question = question_flight.do(key, generate_fresh_question, key)
+    
+    return {
+        'statusCode': 200,
+        'headers': {'X-Question-Source': source},
+        'body': json.dumps({'question': question})
+    }
+
+def generate_question_text(key):
+    difficulty, category, personality = key
+    
+    prompt = QUESTION_PROMPT_TEMPLATE.format(
+        difficulty=difficulty,
+        category=category,
+        personality=PERSONALITIES[personality]
     )
     
-    result = json.loads(response['body'].read())
-    evaluation = json.loads(result['results'][0]['outputText'])
+    output = call_model(question_model, lambda: question_model.invoke(prompt, QUESTION_GENERATION_CONFIG))
+    return output.strip()
+
+def generate_fresh_question(key):
+    for attempt in range(QUESTION_DEDUPE_RETRIES + 1):
+        question = generate_question_text(key)
+        # The last attempt is served (and indexed) even when it is a near-duplicate
+        last = attempt == QUESTION_DEDUPE_RETRIES
+        if is_new_question(question, force=last) or last:
+            return question
+
+def get_question_index():
+    global _question_index
+    if _question_index is None:
+        with _question_index_lock:
+            if _question_index is None:
+                # Seed with the shared bank on first use rather than at import; the bank is pinned so
+                # generated questions never evict it, and its signatures are precomputed offline
+                from question_bank import BANK, QUESTION_SIGNATURES_PATH
+                index = NearDuplicateIndex()
+                texts = [question['text'] for question in BANK.questions]
+                band_keys = load_signatures(QUESTION_SIGNATURES_PATH, texts, index.rows * index.bands, index.bands)
+                for text, keys in zip(texts, band_keys or [None] * len(texts)):
+                    index.pin(text, keys)
+                _question_index = index
+    return _question_index
+
+def is_new_question(question, force=False):
+    return get_question_index().add(question, force=force)
+
+# Refill threads keep running while the container is warm; near-duplicates never enter the pool
+question_pool = QuestionPool(generate_question_text, accept=is_new_question)
+
+def evaluate_answer(data):
+    try:
+        evaluation, cached = run_evaluation(data)
+    except EvaluationParseError as e:
+        return {'statusCode': 502, 'body': json.dumps({'error': f'Unusable evaluation from model: {e}'})}
     
     return {
         'statusCode': 200,
+        'headers': {'X-Cache': 'HIT' if cached else 'MISS', 'X-Prompt-Version': EVALUATION_PROMPT_VERSION},
         'body': json.dumps(evaluation)
-    }
\ No newline at end of file
+    }
+
+def run_evaluation(data):
+    cached = evaluation_cache.get(data['question'], data['answer'])
+    if cached is not None:
+        return cached, True
+    
+    # Empty or clearly off-topic answers are scored locally without a model call
+    screened = prescreen(data['question'], data['answer'])
+    if screened is not None:
+        return screened, False
+    
+    key = make_key(data['question'], data['answer'], EVALUATION_PROMPT_VERSION)
+    return evaluation_flight.do(key, evaluate_with_model, data), False
+
+def evaluate_with_model(data):
+    evaluation = parse_or_repair(invoke_evaluation_model(build_evaluation_prompt(data)))
+    evaluation_cache.set(data['question'], data['answer'], evaluation)
+    return evaluation
+
+def invoke_evaluation_model(prompt):
+    return call_model(evaluation_model, lambda: evaluation_model.invoke(prompt, EVALUATION_GENERATION_CONFIG))
+
+def parse_or_repair(output, error=None):
+    # Only output that fails extraction or validation costs a (short) repair call
+    if error is None:
+        try:
+            return parse_evaluation(output)
+        except EvaluationParseError as e:
+            error = e
+    for _ in range(EVALUATION_REPAIR_ATTEMPTS):
+        output = invoke_evaluation_model(REPAIR_PROMPT_TEMPLATE.format(error=error, output=output))
+        try:
+            return parse_evaluation(output)
+        except EvaluationParseError as e:
+            error = e
+    raise error
+
+def evaluate_answers_batch(data):
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return {'statusCode': 400, 'body': json.dumps({'error': 'items must be a non-empty list'})}
+    if len(items) > BATCH_MAX_ITEMS:
+        return {'statusCode': 400, 'body': json.dumps({'error': f'At most {BATCH_MAX_ITEMS} items per batch'})}
+    
+    results = [None] * len(items)
+    
+    # Identical submissions share one model call
+    groups = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('question') or not item.get('answer'):
+            results[index] = {'index': index, 'status': 'error', 'error': 'question and answer are required'}
+            continue
+        key = make_key(item['question'], item['answer'], EVALUATION_PROMPT_VERSION)
+        groups.setdefault(key, []).append(index)
+    
+    if groups:
+        deadline = getattr(_request, 'deadline', None)
+        with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(groups))) as executor:
+            futures = {
+                executor.submit(with_deadline, deadline, run_evaluation, items[indexes[0]]): indexes
+                for indexes in groups.values()
+            }
+            for future in as_completed(futures):
+                try:
+                    evaluation, cached = future.result()
+                    outcome = {'status': 'ok', 'cached': cached, 'evaluation': evaluation}
+                except ModelThrottledError as e:
+                    # Clients can resubmit just these items after backing off
+                    outcome = {'status': 'throttled', 'error': str(e), 'retry_after': e.retry_after}
+                except Exception as e:
+                    outcome = {'status': 'error', 'error': str(e)}
+                for index in futures[future]:
+                    results[index] = dict(outcome, index=index)
+    
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    
+    return {
+        'statusCode': 200,
+        'headers': {'X-Prompt-Version': EVALUATION_PROMPT_VERSION},
+        'body': json.dumps({
+            'results': results,
+            'succeeded': len(results) - failed,
+            'failed': failed
+        })
+    }
+
+def evaluate_answer_stream(data):
+    # Not incremental: the Python runtime behind API Gateway REST returns one response, so every
+    # event is produced before the body is sent. The route keeps the SSE event format for clients
+    events = [format_sse(event, payload) for event, payload in stream_evaluation(data)]
+    
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache',
+                    'X-Prompt-Version': EVALUATION_PROMPT_VERSION},
+        'body': ''.join(events)
+    }
+
+def stream_evaluation(data):
+    # Yields ('field', ...) per evaluation field in output order, then ('done', evaluation) or ('error', ...)
+    cached = evaluation_cache.get(data['question'], data['answer'])
+    if cached is not None:
+        for key, value in cached.items():
+            yield 'field', {'key': key, 'value': value}
+        yield 'done', cached
+        return
+    
+    screened = prescreen(data['question'], data['answer'])
+    if screened is not None:
+        for key, value in screened.items():
+            yield 'field', {'key': key, 'value': value}
+        yield 'done', screened
+        return
+    
+    # The whole model stream is read inside the throttled call, so a throttle or model error
+    # mid-stream is retried (or rejected) by the limiter like any other model call
+    prompt = build_evaluation_prompt(data)
+    try:
+        pieces = call_model(evaluation_model,
+                            lambda: list(evaluation_model.invoke_stream(prompt, EVALUATION_GENERATION_CONFIG)))
+    except ModelThrottledError:
+        raise
+    except Exception as e:
+        yield 'error', {'error': f'Model stream failed: {e}', 'partial': {}}
+        return
+    
+    parser = IncrementalJSONParser()
+    for text in pieces:
+        for key, value in parser.feed(text):
+            yield 'field', {'key': key, 'value': value}
+    
+    try:
+        if not parser.complete:
+            raise EvaluationParseError("Incomplete evaluation from model")
+        evaluation = validate_evaluation(parser.result())
+    except EvaluationParseError as e:
+        try:
+            evaluation = parse_or_repair(parser.text, e)
+        except EvaluationParseError as e:
+            yield 'error', {'error': str(e), 'partial': parser.result()}
+            return
+        # Send the repaired values so clients replace any malformed partial fields
+        for key, value in evaluation.items():
+            yield 'field', {'key': key, 'value': value}
+    
+    evaluation_cache.set(data['question'], data['answer'], evaluation)
+    yield 'done', evaluation
+
+def format_sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def build_evaluation_prompt(data):
+    return EVALUATION_PROMPT_TEMPLATE.format(question=data['question'], answer=data['answer'])
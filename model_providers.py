@@ -0,0 +1,226 @@
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from evaluation_parser import CRITERIA
+
+# Provider selection (override via environment); the route-specific settings fall back to these
+MODEL_PROVIDER = os.environ.get('MODEL_PROVIDER', 'titan')
+MODEL_ID = os.environ.get('MODEL_ID')
+
+TITAN_MODEL_ID = 'amazon.titan-text-express-v1'
+CLAUDE_MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+CLAUDE_API_VERSION = 'bedrock-2023-05-31'
+
+# Fake provider behaviour: log-normal latency around a median, plus injected failures
+FAKE_LATENCY_MS = float(os.environ.get('FAKE_MODEL_LATENCY_MS', 50))
+FAKE_LATENCY_SIGMA = float(os.environ.get('FAKE_MODEL_LATENCY_SIGMA', 0.5))
+FAKE_ERROR_RATE = float(os.environ.get('FAKE_MODEL_ERROR_RATE', 0))
+FAKE_THROTTLE_RATE = float(os.environ.get('FAKE_MODEL_THROTTLE_RATE', 0))
+FAKE_SEED = int(os.environ.get('FAKE_MODEL_SEED', 0))
+
+FAKE_TOPICS = [
+    'caching', 'database indexing', 'rate limiting', 'message queues', 'load balancing',
+    'code review', 'incident response', 'API versioning', 'unit testing', 'schema migrations',
+    'team conflict', 'missed deadlines', 'mentoring', 'prioritization', 'technical debt'
+]
+FAKE_TEMPLATES = [
+    'How would you approach {topic} in a system that is growing quickly?',
+    'Tell me about a time you had to deal with {topic}. What did you learn?',
+    'What trade-offs do you consider when making decisions about {topic}?',
+    'Walk me through how you would explain {topic} to a new team member.',
+    'Describe a mistake you have seen with {topic} and how you would prevent it.'
+]
+
+
+class ModelProvider:
+    """Request/response shape for one text model
+
+    Subclasses turn a prompt and a generation config ({'max_tokens',
+    'temperature'}) into a request body and pull the generated text back
+    out of responses and stream chunks. ``invoke_stream`` sends the request
+    before returning, so throttling surfaces to the caller immediately,
+    and returns an iterator of text pieces.
+    """
+
+    name = None
+
+    def __init__(self, model_id, client_factory):
+        self.model_id = model_id
+        self.client_factory = client_factory
+
+    def build_body(self, prompt, config):
+        raise NotImplementedError
+
+    def output_text(self, result):
+        raise NotImplementedError
+
+    def chunk_text(self, chunk):
+        raise NotImplementedError
+
+    def invoke(self, prompt, config):
+        response = self.client_factory().invoke_model(modelId=self.model_id, body=self.build_body(prompt, config))
+        return self.output_text(json.loads(response['body'].read()))
+
+    def invoke_stream(self, prompt, config):
+        response = self.client_factory().invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=self.build_body(prompt, config)
+        )
+        return self._stream_text(response['body'])
+
+    def _stream_text(self, events):
+        for event in events:
+            chunk = event.get('chunk')
+            if chunk:
+                text = self.chunk_text(json.loads(chunk['bytes']))
+                if text:
+                    yield text
+
+
+class TitanProvider(ModelProvider):
+    """Amazon Titan Text on Bedrock"""
+
+    name = 'titan'
+
+    def __init__(self, model_id=None, client_factory=None):
+        super().__init__(model_id or TITAN_MODEL_ID, client_factory)
+
+    def build_body(self, prompt, config):
+        return json.dumps({
+            'inputText': prompt,
+            'textGenerationConfig': {'maxTokenCount': config['max_tokens'], 'temperature': config['temperature']}
+        })
+
+    def output_text(self, result):
+        return result['results'][0]['outputText']
+
+    def chunk_text(self, chunk):
+        return chunk.get('outputText', '')
+
+
+class ClaudeProvider(ModelProvider):
+    """Anthropic Claude on Bedrock (Messages API)"""
+
+    name = 'claude'
+
+    def __init__(self, model_id=None, client_factory=None):
+        super().__init__(model_id or CLAUDE_MODEL_ID, client_factory)
+
+    def build_body(self, prompt, config):
+        return json.dumps({
+            'anthropic_version': CLAUDE_API_VERSION,
+            'max_tokens': config['max_tokens'],
+            'temperature': config['temperature'],
+            'messages': [{'role': 'user', 'content': prompt}]
+        })
+
+    def output_text(self, result):
+        return ''.join(block.get('text', '') for block in result['content'] if block.get('type') == 'text')
+
+    def chunk_text(self, chunk):
+        if chunk.get('type') == 'content_block_delta':
+            return chunk['delta'].get('text', '')
+        return ''
+
+
+class FakeModelError(Exception):
+    """Injected failure shaped like a botocore ClientError"""
+
+    def __init__(self, code):
+        super().__init__(f"Fake model error: {code}")
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeProvider(ModelProvider):
+    """Local stand-in with seeded latency and failures, for offline load tests
+
+    Prompts that ask for JSON get a well-formed evaluation object; anything
+    else gets an interview question. Evaluations depend only on the prompt
+    and questions come from a seeded generator, so runs are repeatable
+    (up to thread scheduling). Latency is log-normal around
+    ``latency_ms`` (``latency_sigma`` 0 makes it fixed) and each call fails
+    with probability ``throttle_rate`` (ThrottlingException) or
+    ``error_rate`` (InternalServerException).
+    """
+
+    name = 'fake'
+
+    def __init__(self, model_id=None, client_factory=None, latency_ms=FAKE_LATENCY_MS,
+                 latency_sigma=FAKE_LATENCY_SIGMA, error_rate=FAKE_ERROR_RATE,
+                 throttle_rate=FAKE_THROTTLE_RATE, seed=FAKE_SEED):
+        super().__init__(model_id or 'fake', client_factory)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, config):
+        self._simulate()
+        return self.respond(prompt)
+
+    def invoke_stream(self, prompt, config):
+        self._simulate()
+        text = self.respond(prompt)
+        return (text[i:i + 16] for i in range(0, len(text), 16))
+
+    def respond(self, prompt):
+        digest = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16)
+        if 'JSON' in prompt:
+            scores = {
+                criterion: 4 + (digest >> (8 * i)) % 6
+                for i, criterion in enumerate(CRITERIA)
+            }
+            return json.dumps(dict(
+                scores,
+                overall_score=round(sum(scores.values()) / len(scores), 1),
+                feedback="Solid structure; add a concrete example and quantify the outcome.",
+                improved_answer="Lead with the result, then walk through the situation, your actions and what you learned."
+            ))
+        template = FAKE_TEMPLATES[digest % len(FAKE_TEMPLATES)]
+        # Questions vary between calls so the near-duplicate check does not reject every one
+        with self._lock:
+            topic = FAKE_TOPICS[self._random.randrange(len(FAKE_TOPICS))]
+        return template.format(topic=topic)
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            latency = self.latency_ms
+            if self.latency_sigma:
+                latency *= math.exp(self._random.gauss(0, self.latency_sigma))
+            roll = self._random.random()
+        time.sleep(latency / 1000)
+        if roll < self.throttle_rate:
+            raise FakeModelError('ThrottlingException')
+        if roll < self.throttle_rate + self.error_rate:
+            raise FakeModelError('InternalServerException')
+
+
+PROVIDERS = {provider.name: provider for provider in (TitanProvider, ClaudeProvider, FakeProvider)}
+
+
+def build_provider(name=None, model_id=None, client_factory=None):
+    """Build the model provider selected by name ('titan', 'claude' or 'fake')"""
+    name = name or MODEL_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown model provider: {name}")
+    return PROVIDERS[name](model_id, client_factory)
+
+
+def build_route_provider(route, client_factory=None):
+    """Provider for a route ('question' or 'evaluation'), e.g. QUESTION_MODEL_PROVIDER / QUESTION_MODEL_ID"""
+    prefix = route.upper()
+    name = os.environ.get(f'{prefix}_MODEL_PROVIDER') or MODEL_PROVIDER
+    model_id = os.environ.get(f'{prefix}_MODEL_ID')
+    # A global MODEL_ID only applies to routes that keep the global provider
+    if model_id is None and name == MODEL_PROVIDER:
+        model_id = MODEL_ID
+    return build_provider(name, model_id, client_factory)
@@ -0,0 +1,133 @@
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+QUESTION_BANK_PATH = os.environ.get('QUESTION_BANK_PATH', os.path.join(DATA_DIR, 'question_bank.json'))
+# MinHash signatures of the bank for the near-duplicate index (python similarity_index.py <bank> --signatures)
+QUESTION_SIGNATURES_PATH = os.environ.get(
+    'QUESTION_SIGNATURES_PATH', os.path.splitext(QUESTION_BANK_PATH)[0] + '.signatures.json'
+)
+MAX_SAMPLER_SESSIONS = int(os.environ.get('QUESTION_BANK_MAX_SESSIONS', 1000))
+
+INDEXED_FIELDS = ('role', 'round', 'difficulty', 'company')
+
+
+class QuestionBank:
+    """Immutable question bank with posting-list indexes on role, round, difficulty, company and tags
+
+    A question that leaves a field unset matches any value for it, so a
+    company question without a role is served for every role. Each
+    distinct filter is resolved to a tuple of question ids once and
+    memoized, after which lookups are a dict hit.
+    """
+
+    def __init__(self, questions):
+        self.questions = tuple(questions)
+        self._postings = {field: {} for field in INDEXED_FIELDS}
+        self._wildcards = {field: set() for field in INDEXED_FIELDS}
+        self._tags = {}
+        for qid, question in enumerate(self.questions):
+            for field in INDEXED_FIELDS:
+                value = question.get(field)
+                if value is None:
+                    self._wildcards[field].add(qid)
+                else:
+                    self._postings[field].setdefault(value, set()).add(qid)
+            for tag in question.get('tags', ()):
+                self._tags.setdefault(tag, set()).add(qid)
+        self._selections = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=QUESTION_BANK_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def values(self, field):
+        """Distinct explicit values of an indexed field, e.g. the companies with their own questions"""
+        return set(self._postings[field])
+
+    def select(self, role=None, round=None, difficulty=None, company=None, tag=None):
+        """Ids of the questions matching every given filter, memoized per filter"""
+        key = (role, round, difficulty, company, tag)
+        ids = self._selections.get(key)
+        if ids is not None:
+            return ids
+
+        matching = None
+        for field, value in zip(INDEXED_FIELDS, key):
+            if value is None:
+                continue
+            candidates = self._postings[field].get(value, set()) | self._wildcards[field]
+            matching = candidates if matching is None else matching & candidates
+        if tag is not None:
+            tagged = self._tags.get(tag, set())
+            matching = tagged if matching is None else matching & tagged
+        ids = tuple(sorted(range(len(self.questions)) if matching is None else matching))
+        with self._lock:
+            self._selections[key] = ids
+        return ids
+
+
+class QuestionSampler:
+    """Per-session non-repeating draws from a QuestionBank
+
+    Every filter gets its own shuffled cursor: a draw is one step through
+    the shuffled ids, and the ids are reshuffled only after all of them
+    have been served (never starting with the question just asked), so
+    sampling is amortized O(1) and nothing repeats within a cycle.
+    """
+
+    def __init__(self, bank, seed=None):
+        self.bank = bank
+        self._random = random.Random(seed)
+        self._cursors = {}
+
+    def next(self, role=None, round=None, difficulty=None, company=None, tag=None, default=None):
+        """Next question text for the filter, or default when the bank has none"""
+        key = (role, round, difficulty, company, tag)
+        ids = self.bank.select(*key)
+        if not ids:
+            return default
+
+        order, position = self._cursors.get(key, ((), 0))
+        if position >= len(order):
+            last = order[-1] if order else None
+            order = list(ids)
+            self._random.shuffle(order)
+            if len(order) > 1 and order[0] == last:
+                order[0], order[-1] = order[-1], order[0]
+            position = 0
+        self._cursors[key] = (order, position + 1)
+        return self.bank.questions[order[position]]['text']
+
+
+class SamplerRegistry:
+    """Bounded LRU of QuestionSamplers keyed by client session id (for stateless HTTP front ends)"""
+
+    def __init__(self, bank, max_sessions=MAX_SAMPLER_SESSIONS):
+        self.bank = bank
+        self.max_sessions = max_sessions
+        self._samplers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            sampler = self._samplers.get(session_id)
+            if sampler is None:
+                sampler = self._samplers[session_id] = QuestionSampler(self.bank)
+                while len(self._samplers) > self.max_sessions:
+                    self._samplers.popitem(last=False)
+            else:
+                self._samplers.move_to_end(session_id)
+            return sampler
+
+
+# Built once at import so every app shares one index
+BANK = QuestionBank.load()
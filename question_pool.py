@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Pool watermarks (override via environment)
+LOW_WATERMARK = int(os.environ.get('QUESTION_POOL_LOW_WATERMARK', 2))
+HIGH_WATERMARK = int(os.environ.get('QUESTION_POOL_HIGH_WATERMARK', 6))
+REFILL_WORKERS = int(os.environ.get('QUESTION_POOL_REFILL_WORKERS', 2))
+MAX_REJECTIONS = int(os.environ.get('QUESTION_POOL_MAX_REJECTIONS', 3))
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPool:
+    """Pre-generated questions per key, refilled in the background between watermarks
+
+    ``generate`` is called with a key such as (difficulty, category, personality)
+    and must return one question. ``get`` never calls it on the request path:
+    it pops a ready question in O(1) or returns None so the caller can fall
+    back to a synchronous call, and tops the pool up when it drops below the
+    low watermark.
+
+    An optional ``accept(question)`` predicate (e.g. a near-duplicate check)
+    filters generated questions before they are pooled; a refill gives up
+    after ``max_rejections`` consecutive rejects so a repetitive model
+    cannot burn calls indefinitely.
+    """
+
+    def __init__(self, generate, low_watermark=LOW_WATERMARK, high_watermark=HIGH_WATERMARK,
+                 max_workers=REFILL_WORKERS, accept=None, max_rejections=MAX_REJECTIONS):
+        if high_watermark < low_watermark:
+            raise ValueError("high_watermark must not be below low_watermark")
+        self.generate = generate
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.accept = accept
+        self.max_rejections = max_rejections
+        self.rejected = 0
+        self._pools = defaultdict(deque)
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='question-pool')
+
+    def get(self, key):
+        """Pop a pre-generated question for key, or None when the pool is empty"""
+        with self._lock:
+            pool = self._pools[key]
+            question = pool.popleft() if pool else None
+            needs_refill = len(pool) < self.low_watermark
+        if needs_refill:
+            self.refill(key)
+        return question
+
+    def put(self, key, question):
+        """Add a question generated elsewhere, ignoring it when the pool is full"""
+        with self._lock:
+            pool = self._pools[key]
+            if len(pool) < self.high_watermark:
+                pool.append(question)
+
+    def refill(self, key):
+        """Schedule a background top-up of key to the high watermark"""
+        with self._lock:
+            if key in self._refilling:
+                return None
+            self._refilling.add(key)
+        return self._executor.submit(self._refill, key)
+
+    def warm(self, keys):
+        """Schedule refills for several keys, e.g. the most requested combinations"""
+        return [future for future in (self.refill(key) for key in keys) if future is not None]
+
+    def size(self, key):
+        with self._lock:
+            return len(self._pools.get(key, ()))
+
+    def _refill(self, key):
+        try:
+            rejections = 0
+            while self.size(key) < self.high_watermark and rejections < self.max_rejections:
+                question = self.generate(key)
+                if not question:
+                    break
+                if self.accept is not None and not self.accept(question):
+                    rejections += 1
+                    self.rejected += 1
+                    continue
+                rejections = 0
+                self.put(key, question)
+        except Exception:
+            logger.exception("Question pool refill failed for %s", key)
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
@@ -0,0 +1,169 @@
+import json
+import os
+import random
+import threading
+import time
+
+# Per-model limits (override via environment); MODEL_RATE_LIMITS is JSON {"model-id": [rate, burst]}
+DEFAULT_RATE = float(os.environ.get('MODEL_RATE_LIMIT', 5))
+DEFAULT_BURST = float(os.environ.get('MODEL_RATE_BURST', 10))
+MODEL_RATE_LIMITS = json.loads(os.environ.get('MODEL_RATE_LIMITS', '{}'))
+INITIAL_CONCURRENCY = float(os.environ.get('MODEL_INITIAL_CONCURRENCY', 4))
+MAX_CONCURRENCY = float(os.environ.get('MODEL_MAX_CONCURRENCY', 32))
+LATENCY_TARGET = float(os.environ.get('MODEL_LATENCY_TARGET', 10))
+RETRY_BASE_DELAY = float(os.environ.get('MODEL_RETRY_BASE_DELAY', 0.25))
+RETRY_MAX_DELAY = float(os.environ.get('MODEL_RETRY_MAX_DELAY', 4))
+
+THROTTLING_CODES = frozenset(['ThrottlingException', 'TooManyRequestsException', 'ServiceUnavailableException'])
+RETRYABLE_CODES = THROTTLING_CODES | {'InternalServerException', 'ModelNotReadyException'}
+
+
+class ModelThrottledError(Exception):
+    """No capacity for a model call before the request deadline"""
+
+    def __init__(self, message, retry_after=1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def error_code(exc):
+    """AWS error code of a botocore ClientError (duck-typed so botocore stays a lazy import)"""
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code')
+    return None
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``burst``"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline):
+        """Take one token, sleeping until one is available; False if that would pass the deadline"""
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease
+
+    Each success without congestion raises the limit by 1/limit (about +1
+    per limit's worth of calls); a throttle halves it, and a call slower
+    than ``latency_target`` trims it by 10%.
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=1, maximum=MAX_CONCURRENCY,
+                 latency_target=LATENCY_TARGET):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.inflight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline):
+        with self._condition:
+            while self.inflight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.inflight += 1
+            return True
+
+    def release(self, latency=None, throttled=False):
+        with self._condition:
+            self.inflight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif latency is None:
+                pass  # other failures say nothing about capacity
+            elif latency > self.latency_target:
+                self.limit = max(self.minimum, self.limit * 0.9)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ModelThrottle:
+    """Admission control for one model: token bucket for rate, AIMD limiter for concurrency
+
+    ``call`` queues until both admit the request, retries throttled or
+    transient failures with jittered exponential backoff, and gives up
+    with ModelThrottledError once the caller's deadline would be missed.
+    """
+
+    def __init__(self, model_id):
+        rate, burst = MODEL_RATE_LIMITS.get(model_id, (DEFAULT_RATE, DEFAULT_BURST))
+        self.model_id = model_id
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AIMDLimiter()
+        self.throttles = 0
+        self.rejections = 0
+
+    def call(self, fn, deadline):
+        attempt = 0
+        while True:
+            # An expired request gets nothing, even when capacity is free
+            if time.monotonic() >= deadline or not self.bucket.acquire(deadline) or not self.limiter.acquire(deadline):
+                self.rejections += 1
+                raise ModelThrottledError(f"No capacity for {self.model_id} before the request deadline")
+
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                code = error_code(e)
+                self.limiter.release(throttled=code in THROTTLING_CODES)
+                if code not in RETRYABLE_CODES:
+                    raise
+                if code in THROTTLING_CODES:
+                    self.throttles += 1
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if time.monotonic() + delay >= deadline:
+                    self.rejections += 1
+                    raise ModelThrottledError(f"{self.model_id} still throttled at the request deadline",
+                                              retry_after=delay) from e
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.limiter.release(latency=time.monotonic() - start)
+            return result
+
+    def stats(self):
+        return {
+            'concurrency_limit': round(self.limiter.limit, 2),
+            'inflight': self.limiter.inflight,
+            'throttles': self.throttles,
+            'rejections': self.rejections
+        }
+
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(model_id):
+    """Process-wide ModelThrottle for a model ID"""
+    with _throttles_lock:
+        if model_id not in _throttles:
+            _throttles[model_id] = ModelThrottle(model_id)
+        return _throttles[model_id]
@@ -0,0 +1,168 @@
+import html
+import io
+import os
+import tempfile
+from string import Template
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+try:
+    import weasyprint
+except ImportError:  # PDF rendering is optional; the HTML report prints to PDF from a browser
+    weasyprint = None
+
+# Export tuning (override via environment)
+EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', 2000))
+SPOOL_MAX_BYTES = int(os.environ.get('EXPORT_SPOOL_MAX_BYTES', 8 * 1024 * 1024))
+
+PARQUET_AVAILABLE = pq is not None
+PDF_AVAILABLE = weasyprint is not None
+
+REPORT_HEAD = Template("""<html>
+<head>
+    <meta charset="utf-8">
+    <title>Interview Performance Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .header { text-align: center; color: #007bff; }
+        .section { margin: 30px 0; }
+        .metric { display: inline-block; margin: 10px; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }
+        table { width: 100%; border-collapse: collapse; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🤖 AI Interview Performance Report</h1>
+        <p>Generated on $generated</p>
+    </div>
+
+    <div class="section">
+        <h2>📊 Performance Summary</h2>
+        <div class="metric"><strong>Total Interviews:</strong> $total</div>
+        <div class="metric"><strong>Average Score:</strong> $average/10</div>
+        <div class="metric"><strong>Best Performance:</strong> $best/10</div>
+    </div>
+
+    <div class="section">
+        <h2>📈 $title</h2>
+        <table>
+            <tr><th>Date</th><th>Role</th><th>Round</th><th>Score</th></tr>
+""")
+REPORT_ROW = '            <tr><td>{}</td><td>{}</td><td>{}</td><td>{}/10</td></tr>\n'
+REPORT_FOOT = """        </table>
+    </div>
+</body>
+</html>
+"""
+
+
+def frame_rows(frames, columns):
+    """Yield plain row lists from DataFrame chunks, with missing values as None"""
+    for df in frames:
+        chunk = df.reindex(columns=columns).astype(object)
+        yield from chunk.where(chunk.notna(), None).values.tolist()
+
+
+def write_excel(sheets):
+    """Write (title, header, rows) sheets with a write-only workbook, returning a rewound spool file
+
+    Rows are streamed straight to the sheet XML, so memory stays flat no
+    matter how many rows the history sheet has; the finished workbook lives
+    in memory up to SPOOL_MAX_BYTES and spills to a temp file beyond that.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, header, rows in sheets:
+        sheet = workbook.create_sheet(title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    workbook.save(spool)
+    spool.seek(0)
+    return spool
+
+
+def write_csv(frames, columns):
+    """Write DataFrame chunks as one CSV, returning a rewound spool file"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    text = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+    header = True
+    for df in frames:
+        df.reindex(columns=columns).to_csv(text, header=header, index=False)
+        header = False
+    if header:
+        text.write(','.join(columns) + '\n')
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    return spool
+
+
+def write_parquet(frames, columns):
+    """Write DataFrame chunks as row groups of one Parquet file, returning a rewound spool file"""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    writer = None
+    for df in frames:
+        chunk = df.reindex(columns=columns)
+        if writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = pq.ParquetWriter(spool, table.schema)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+    spool.seek(0)
+    return spool
+
+
+def report_rows(df):
+    """Format a DataFrame chunk into report table rows, column at a time"""
+    dates = df['timestamp'].dt.strftime('%Y-%m-%d')
+    roles = df['role'].str.upper().map(html.escape)
+    rounds = df['round'].str.title().map(html.escape)
+    scores = df['overall_score'].map('{:.1f}'.format)
+    return ''.join(map(REPORT_ROW.format, dates, roles, rounds, scores))
+
+
+def write_html_report(summary, frames, title='Interview History'):
+    """Render the performance report for DataFrame chunks, returning a rewound spool file
+
+    The page is written piecewise into the spool (one join per chunk), so
+    generation is linear in the number of rows.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    text = io.TextIOWrapper(spool, encoding='utf-8')
+    text.write(REPORT_HEAD.substitute(summary, title=html.escape(title)))
+    for df in frames:
+        text.write(report_rows(df))
+    text.write(REPORT_FOOT)
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    return spool
+
+
+def write_pdf_report(summary, frames, title='Interview History'):
+    """Render the performance report straight to PDF, returning a rewound spool file"""
+    if not PDF_AVAILABLE:
+        raise RuntimeError("PDF export requires weasyprint")
+
+    with write_html_report(summary, frames, title) as report:
+        document = weasyprint.HTML(string=report.read().decode('utf-8'))
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    document.write_pdf(spool)
+    spool.seek(0)
+    return spool
@@ -0,0 +1,104 @@
+import math
+from collections import deque
+
+RECENT_WINDOW = 3
+
+
+class RunningStats:
+    """Constant-time running statistics over a stream of scores
+
+    Keeps count, sum, min/max, first/last, a Welford mean/variance and the
+    sum of a fixed-size trailing window, all updated in O(1) per value.
+    """
+
+    def __init__(self, window=RECENT_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.first = None
+        self.last = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._window = deque(maxlen=window)
+        self._window_total = 0.0
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if self.first is None:
+            self.first = value
+        self.last = value
+
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+        if len(self._window) == self._window.maxlen:
+            self._window_total -= self._window[0]
+        self._window.append(value)
+        self._window_total += value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def recent_count(self):
+        return len(self._window)
+
+    @property
+    def recent_mean(self):
+        return self._window_total / len(self._window) if self._window else 0.0
+
+    @property
+    def improvement(self):
+        """Percent change from the first to the latest value, or None with fewer than two values"""
+        if self.count < 2 or not self.first:
+            return None
+        return (self.last - self.first) / self.first * 100
+
+
+class ScoreAggregates:
+    """Running overall stats plus per-bucket stats (round, company, role) for a score stream"""
+
+    def __init__(self, buckets=('round', 'company', 'role'), window=RECENT_WINDOW):
+        self.overall = RunningStats(window)
+        self.buckets = {name: {} for name in buckets}
+        self._window = window
+
+    def add(self, value, **labels):
+        self.overall.add(value)
+        for name, groups in self.buckets.items():
+            label = labels.get(name)
+            if label is None:
+                continue
+            if label not in groups:
+                groups[label] = RunningStats(self._window)
+            groups[label].add(value)
+
+    def means(self, bucket):
+        """{label: mean} for one bucket, e.g. average score per round"""
+        return {label: stats.mean for label, stats in self.buckets[bucket].items()}
+
+    def counts(self, bucket):
+        """{label: number of scores} for one bucket"""
+        return {label: stats.count for label, stats in self.buckets[bucket].items()}
+
+    def best(self, bucket):
+        """Label with the highest mean score in a bucket, or None when empty"""
+        groups = self.buckets[bucket]
+        if not groups:
+            return None
+        return max(groups, key=lambda label: groups[label].mean)
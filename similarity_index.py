@@ -0,0 +1,243 @@
+"""Near-duplicate detection for interview questions with MinHash + LSH
+
+Pure Python, so it runs in the Lambda runtime without numpy. Run as a
+script to dedupe a question bank offline and precompute its signatures:
+
+    python similarity_index.py data/question_bank.json [--threshold 0.6] [--write] [--signatures]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import struct
+import threading
+from collections import deque
+from hashlib import blake2b
+
+SIMILARITY_THRESHOLD = float(os.environ.get('QUESTION_SIMILARITY_THRESHOLD', 0.6))
+NUM_PERMUTATIONS = int(os.environ.get('QUESTION_MINHASH_PERMUTATIONS', 64))
+LSH_BANDS = int(os.environ.get('QUESTION_LSH_BANDS', 16))
+MAX_INDEXED = int(os.environ.get('QUESTION_INDEX_MAX_ITEMS', 5000))
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by can do does for from how i in is it of on or that the this to was we what '
+    'when where which who why will with would you your'.split()
+)
+MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def shingles(text):
+    """Content words plus adjacent word pairs of the normalized text"""
+    words = [word for word in _WORD.findall(text.lower()) if word not in STOP_WORDS]
+    return set(words) | {f'{a} {b}' for a, b in zip(words, words[1:])}
+
+
+def hash64(data):
+    return struct.unpack('<Q', blake2b(data, digest_size=8).digest())[0]
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHasher:
+    """Fixed family of num_perm universal hash functions over 64-bit shingle hashes"""
+
+    def __init__(self, num_perm=NUM_PERMUTATIONS, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, features):
+        hashes = [hash64(feature.encode()) for feature in features]
+        if not hashes:
+            return (0,) * self.num_perm
+        return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._params)
+
+
+class NearDuplicateIndex:
+    """LSH index of recent questions answering "is this a near-duplicate of anything indexed?"
+
+    Signatures are split into bands; texts sharing any band bucket are
+    candidates, and a candidate counts as a duplicate when the exact
+    Jaccard similarity of the shingle sets reaches ``threshold``. Only the
+    newest ``max_items`` added texts are kept, so memory stays bounded in a
+    long-lived container; pinned texts (a question bank) are never evicted.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERMUTATIONS, bands=LSH_BANDS,
+                 max_items=MAX_INDEXED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self.rejected = 0
+        self._hasher = MinHasher(num_perm)
+        self._buckets = [{} for _ in range(bands)]
+        self._items = {}
+        self._order = deque()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def band_keys(self, text):
+        """LSH bucket key of text in each band, as stored by write_signatures"""
+        return self._band_keys(self._hasher.signature(shingles(text)))
+
+    def _band_keys(self, signature):
+        # Each band's rows are folded into one 64-bit key so precomputed keys stay compact
+        rows = f'<{self.rows}Q'
+        return [hash64(struct.pack(rows, *signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def _match(self, features, band_keys):
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(band_key, ()))
+        best = None
+        for item_id in candidates:
+            text, item_features, _ = self._items[item_id]
+            score = jaccard(features, item_features)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (text, score)
+        return best
+
+    def find(self, text):
+        """(indexed text, similarity) of the closest near-duplicate, or None"""
+        features = shingles(text)
+        band_keys = self._band_keys(self._hasher.signature(features))
+        with self._lock:
+            return self._match(features, band_keys)
+
+    def add(self, text, force=False):
+        """Index text unless it near-duplicates an indexed one; returns whether it was new
+
+        With force=True the text is indexed either way (e.g. a question
+        served despite the match).
+        """
+        features = shingles(text)
+        band_keys = self._band_keys(self._hasher.signature(features))
+        with self._lock:
+            if self._match(features, band_keys) is not None:
+                self.rejected += 1
+                if not force:
+                    return False
+                is_new = False
+            else:
+                is_new = True
+            self._order.append(self._insert(text, features, band_keys))
+            while len(self._order) > self.max_items:
+                self._evict(self._order.popleft())
+            return is_new
+
+    def pin(self, text, band_keys=None):
+        """Index text permanently, outside the max_items window
+
+        Band keys precomputed with the same num_perm and bands (see
+        write_signatures) skip the MinHash step, which dominates the cost
+        of indexing a large bank.
+        """
+        features = shingles(text)
+        band_keys = list(band_keys) if band_keys else self._band_keys(self._hasher.signature(features))
+        with self._lock:
+            self._insert(text, features, band_keys)
+
+    def _insert(self, text, features, band_keys):
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = (text, features, band_keys)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets.setdefault(band_key, set()).add(item_id)
+        return item_id
+
+    def _evict(self, item_id):
+        _, _, band_keys = self._items.pop(item_id)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets[band_key]
+            bucket.discard(item_id)
+            if not bucket:
+                del buckets[band_key]
+
+
+def dedupe(texts, threshold=SIMILARITY_THRESHOLD):
+    """Indices of texts to keep (first of each near-duplicate group) and [(dropped, kept_text, score)]"""
+    index = NearDuplicateIndex(threshold=threshold, max_items=max(len(texts), 1))
+    kept, dropped = [], []
+    for position, text in enumerate(texts):
+        match = index.find(text)
+        if match is None:
+            index.add(text, force=True)
+            kept.append(position)
+        else:
+            dropped.append((position, match[0], match[1]))
+    return kept, dropped
+
+
+def texts_digest(texts):
+    """Fingerprint of an ordered list of texts, to tell when precomputed signatures are stale"""
+    digest = blake2b(digest_size=16)
+    for text in texts:
+        digest.update(text.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+def write_signatures(path, texts, num_perm=NUM_PERMUTATIONS, bands=LSH_BANDS):
+    """Precompute the LSH band keys of texts (e.g. a question bank) into a JSON file"""
+    index = NearDuplicateIndex(num_perm=num_perm, bands=bands)
+    payload = {
+        'num_perm': num_perm,
+        'bands': bands,
+        'digest': texts_digest(texts),
+        'band_keys': [index.band_keys(text) for text in texts]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'))
+
+
+def load_signatures(path, texts, num_perm=NUM_PERMUTATIONS, bands=LSH_BANDS):
+    """Band keys written by write_signatures, or None when missing or built for other texts or settings"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (payload.get('num_perm'), payload.get('bands'), payload.get('digest')) != (num_perm, bands, texts_digest(texts)):
+        return None
+    return payload['band_keys']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help="question bank JSON (a list of objects with a 'text' field)")
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument('--write', action='store_true', help="rewrite the bank without the duplicates")
+    parser.add_argument('--signatures', action='store_true',
+                        help="precompute MinHash signatures of the bank into <bank>.signatures.json")
+    args = parser.parse_args()
+
+    with open(args.path, encoding='utf-8') as f:
+        questions = json.load(f)
+    kept, dropped = dedupe([question['text'] for question in questions], args.threshold)
+
+    for position, kept_text, score in dropped:
+        print(f"{score:.2f}  {questions[position]['text']!r}\n      ~ {kept_text!r}")
+    print(f"{len(dropped)} near-duplicates of {len(questions)} questions at threshold {args.threshold}")
+
+    if args.write and dropped:
+        questions = [questions[i] for i in kept]
+        with open(args.path, 'w', encoding='utf-8') as f:
+            f.write('[\n' + ',\n'.join('  ' + json.dumps(question, ensure_ascii=False) for question in questions) + '\n]\n')
+
+    if args.signatures:
+        path = os.path.splitext(args.path)[0] + '.signatures.json'
+        write_signatures(path, [question['text'] for question in questions])
+        print(f"Wrote signatures for {len(questions)} questions to {path}")
+
+
+if __name__ == '__main__':
+    main()
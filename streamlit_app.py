@@ -1,6 +1,7 @@
 import streamlit as st
-import random
-import time
+from running_stats import ScoreAggregates
+from question_bank import BANK, QuestionSampler
+import heuristic_scorer
 
 # Initialize session state
 if 'total_scores' not in st.session_state:
@@ -11,81 +12,10 @@ if 'strengths' not in st.session_state:
     st.session_state.strengths = []
 if 'weaknesses' not in st.session_state:
     st.session_state.weaknesses = []
-if 'round_scores' not in st.session_state:
-    st.session_state.round_scores = {'Technical': [], 'HR': [], 'Managerial': []}
-
-# Question database
-QUESTIONS = {
-    'sde': {
-        'technical': [
-            "Design a URL shortener like bit.ly with high availability",
-            "Implement rate limiting for an API",
-            "Design a chat application system architecture",
-            "How would you handle database scaling?",
-            "Explain microservices vs monolithic architecture"
-        ],
-        'hr': [
-            "Why do you want to work in software engineering?",
-            "Describe your coding journey and what motivates you",
-            "How do you debug complex technical issues?",
-            "Tell me about a challenging project you worked on",
-            "How do you stay updated with new technologies?"
-        ],
-        'managerial': [
-            "How would you mentor junior developers?",
-            "How do you prioritize features with tight deadlines?",
-            "How would you handle technical debt in a project?",
-            "Describe your approach to code reviews",
-            "How do you handle disagreements in technical decisions?"
-        ]
-    },
-    'ml': {
-        'technical': [
-            "Design a recommendation system for e-commerce",
-            "How do you handle imbalanced datasets?",
-            "Explain the bias-variance tradeoff",
-            "How would you deploy an ML model at scale?",
-            "What's your approach to feature engineering?"
-        ],
-        'hr': [
-            "Why did you choose machine learning?",
-            "How do you explain ML concepts to non-technical people?",
-            "How do you stay updated with ML research?",
-            "Describe a challenging ML project you worked on",
-            "What's your favorite ML algorithm and why?"
-        ],
-        'managerial': [
-            "How would you lead an ML team?",
-            "How do you balance model accuracy vs speed?",
-            "How do you manage ML project timelines?",
-            "How do you handle model performance degradation?",
-            "How do you ensure ML model fairness?"
-        ]
-    },
-    'cloud': {
-        'technical': [
-            "Design a multi-region cloud architecture",
-            "How do you implement auto-scaling?",
-            "What are your cloud cost optimization strategies?",
-            "Explain containerization vs virtualization",
-            "How do you ensure cloud security?"
-        ],
-        'hr': [
-            "Why cloud computing over traditional infrastructure?",
-            "How do you explain cloud benefits to clients?",
-            "How do you handle cloud migration challenges?",
-            "Describe your experience with cloud platforms",
-            "What cloud certifications do you have?"
-        ],
-        'managerial': [
-            "How would you lead a cloud transformation?",
-            "How do you balance security vs accessibility?",
-            "How do you manage cloud budgets?",
-            "How do you handle cloud vendor lock-in?",
-            "How do you ensure cloud compliance?"
-        ]
-    }
-}
+if 'score_stats' not in st.session_state:
+    st.session_state.score_stats = ScoreAggregates(buckets=('round',))
+if 'question_sampler' not in st.session_state:
+    st.session_state.question_sampler = QuestionSampler(BANK)
 
 st.title("🤖 AI Mock Interview Engine")
 
@@ -128,8 +58,8 @@ with col2:
     show_ai_answer = st.button("🤖 Show AI Answer First")
 
 if get_question:
-    questions = QUESTIONS.get(role_key, {}).get(st.session_state.current_round, ["Tell me about yourself"])
-    st.session_state.current_question = random.choice(questions)
+    st.session_state.current_question = st.session_state.question_sampler.next(
+        role=role_key, round=st.session_state.current_round, default="Tell me about yourself")
 
 # Show AI answer without user input
 if show_ai_answer and 'current_question' in st.session_state:
@@ -148,22 +78,16 @@ if 'current_question' in st.session_state:
     if st.button("📊 Submit & Get Evaluation", type="primary"):
         if answer.strip():
             with st.spinner("AI is evaluating your answer..."):
-                time.sleep(1)
-                
-                # Generate realistic scores
-                scores = {
-                    'technical_accuracy': random.randint(6, 10),
-                    'clarity': random.randint(6, 10),
-                    'confidence': random.randint(5, 9),
-                    'communication': random.randint(6, 10),
-                    'relevance': random.randint(7, 10)
-                }
+                # Score locally from length, structure, keyword coverage and STAR cues
+                evaluation = heuristic_scorer.score_answer(
+                    st.session_state.current_question, answer, st.session_state.current_round)
+                scores = {name: evaluation[name] for name in heuristic_scorer.CRITERIA}
                 
                 overall = sum(scores.values()) / 5
                 
                 # Store scores by round
                 st.session_state.total_scores.append(overall)
-                st.session_state.round_scores[st.session_state.current_round.title()].append(overall)
+                st.session_state.score_stats.add(overall, round=st.session_state.current_round)
                 
                 # Strengths & Weaknesses Detection
                 if overall >= 8:
@@ -176,7 +100,7 @@ if 'current_question' in st.session_state:
                         st.session_state.weaknesses.append(weakness.replace('_', ' ').title())
                 
                 # Dynamic difficulty adjustment
-                avg_score = sum(st.session_state.total_scores) / len(st.session_state.total_scores)
+                avg_score = st.session_state.score_stats.overall.mean
                 if avg_score >= 8:
                     st.session_state.difficulty = 'hard'
                 elif avg_score >= 6:
@@ -195,8 +119,7 @@ if 'current_question' in st.session_state:
                 
                 with col2:
                     st.subheader("💡 AI Feedback")
-                    feedback = "Great answer! You demonstrated good understanding. Consider adding more specific examples."
-                    st.write(feedback)
+                    st.write(evaluation['feedback'])
                     
                     st.subheader("✨ Improved Answer")
                     improved_answer = "Your answer could be enhanced by including concrete examples and quantifiable results."
@@ -213,17 +136,17 @@ if 'current_question' in st.session_state:
 # Enhanced Stats Sidebar
 st.sidebar.header("📊 Performance Dashboard")
 if st.session_state.total_scores:
-    avg_score = sum(st.session_state.total_scores) / len(st.session_state.total_scores)
-    st.sidebar.metric("Overall Average", f"{avg_score:.1f}/10")
-    st.sidebar.metric("Questions Completed", len(st.session_state.total_scores))
+    stats = st.session_state.score_stats
+    st.sidebar.metric("Overall Average", f"{stats.overall.mean:.1f}/10")
+    st.sidebar.metric("Questions Completed", stats.overall.count)
     st.sidebar.metric("Current Difficulty", st.session_state.difficulty.title())
     
     # Round-wise performance
     st.sidebar.subheader("🔄 Round Performance")
-    for round_name, scores in st.session_state.round_scores.items():
-        if scores:
-            avg = sum(scores) / len(scores)
-            st.sidebar.write(f"{round_name}: {avg:.1f}/10 ({len(scores)} questions)")
+    for round_key, round_name in [('technical', 'Technical'), ('hr', 'HR'), ('managerial', 'Managerial')]:
+        round_stats = stats.buckets['round'].get(round_key)
+        if round_stats:
+            st.sidebar.write(f"{round_name}: {round_stats.mean:.1f}/10 ({round_stats.count} questions)")
     
     # Strengths & Weaknesses
     if st.session_state.strengths:
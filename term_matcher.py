@@ -0,0 +1,16 @@
+import re
+
+
+def compile_terms(terms):
+    """One case-insensitive regex matching any of terms as a whole word or phrase
+
+    Terms cannot match with a letter or digit on either side, so 'ml' does
+    not fire inside 'html'. Longer terms come first in the alternation, so
+    'machine learning' beats any shorter term that overlaps it. Group 1
+    holds the matched term.
+    """
+    ordered = sorted({term.lower() for term in terms}, key=len, reverse=True)
+    return re.compile(
+        r'(?<![a-z0-9])(' + '|'.join(re.escape(term) for term in ordered) + r')(?![a-z0-9])',
+        re.IGNORECASE
+    )
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from evaluation_parser import (CRITERIA, EvaluationParseError, IncrementalJSONParser, coerce_score,
+                               iter_json_objects, parse_evaluation, validate_evaluation)
+
+EVALUATION = {
+    'technical_accuracy': 8, 'clarity': 7, 'confidence': 6, 'communication': 7, 'relevance': 9,
+    'overall_score': 7.4, 'feedback': 'Good {structure}', 'improved_answer': 'Say "more"'
+}
+
+
+def feed_all(parser, text, size):
+    fields = []
+    for i in range(0, len(text), size):
+        fields.extend(parser.feed(text[i:i + size]))
+    return fields
+
+
+def test_parse_evaluation_plain_json():
+    assert parse_evaluation(json.dumps(EVALUATION)) == EVALUATION
+
+
+def test_parse_evaluation_ignores_surrounding_prose():
+    text = f"Here is the evaluation:\n{json.dumps(EVALUATION)}\nHope this helps!"
+    assert parse_evaluation(text) == EVALUATION
+
+
+def test_parse_evaluation_skips_preamble_object():
+    text = '{"note": "x"} then ' + json.dumps(EVALUATION)
+    assert parse_evaluation(text) == EVALUATION
+
+
+def test_parse_evaluation_skips_malformed_object():
+    text = '{"clarity": 7,} ' + json.dumps(EVALUATION)
+    assert parse_evaluation(text) == EVALUATION
+
+
+def test_parse_evaluation_reports_validation_error():
+    with pytest.raises(EvaluationParseError, match='relevance'):
+        parse_evaluation('{"note": "x"} {"technical_accuracy": 8, "clarity": 7, "confidence": 6, "communication": 7}')
+
+
+def test_parse_evaluation_without_json():
+    with pytest.raises(EvaluationParseError):
+        parse_evaluation('The answer was good, 8/10.')
+
+
+def test_validate_evaluation_coerces_keys_and_scores():
+    evaluation = validate_evaluation({
+        'Technical Accuracy': '8/10', 'clarity': '7', 'Confidence': 6.5, 'communication': 12, 'relevance': '9 out of 10'
+    })
+    assert [evaluation[name] for name in CRITERIA] == [8, 7, 6.5, 10, 9]
+    assert evaluation['overall_score'] == 8.1
+    assert evaluation['feedback'] == '' and evaluation['improved_answer'] == ''
+
+
+@pytest.mark.parametrize('value, expected', [
+    (8, 8), ('8.5', 8.5), ('8/10', 8), (0, 1), (True, None), ('n/a', None), (None, None)
+])
+def test_coerce_score(value, expected):
+    assert coerce_score(value) == expected
+
+
+def test_iter_json_objects_ignores_braces_in_strings():
+    text = 'a {"x": "}{\\""} b {"y": {"z": 1}} c'
+    assert list(iter_json_objects(text)) == [{'x': '}{"'}, {'y': {'z': 1}}]
+
+
+def test_iter_json_objects_restarts_after_stray_brace():
+    text = 'Scores {as promised: {"a": 1} and {not json} then {"b": 2}'
+    assert list(iter_json_objects(text)) == [{'a': 1}, {'b': 2}]
+
+
+@pytest.mark.parametrize('size', [1, 7, 1000])
+def test_incremental_parser_emits_every_field(size):
+    parser = IncrementalJSONParser()
+    fields = feed_all(parser, 'Sure! ' + json.dumps(EVALUATION) + ' trailing', size)
+    assert dict(fields) == EVALUATION
+    assert [key for key, _ in fields] == list(EVALUATION)
+    assert parser.complete
+    assert parser.result() == EVALUATION
+
+
+def test_incremental_parser_emits_scores_before_object_closes():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"clarity": 7') == []
+    assert parser.feed(', "relevance"') == [('clarity', 7)]
+    assert not parser.complete
+
+
+def test_incremental_parser_keeps_nested_values_whole():
+    parser = IncrementalJSONParser()
+    fields = feed_all(parser, '{"scores": {"a": [1, 2]}, "feedback": "ok"}', 3)
+    assert fields == [('scores', {'a': [1, 2]}), ('feedback', 'ok')]
+
+
+def test_incremental_parser_ignores_input_after_completion():
+    parser = IncrementalJSONParser()
+    parser.feed('{"clarity": 7}')
+    assert parser.feed('{"relevance": 9}') == []
+    assert parser.result() == {'clarity': 7}
+    assert parser.text == '{"clarity": 7}'
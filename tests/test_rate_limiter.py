@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from rate_limiter import AIMDLimiter, ModelThrottle, ModelThrottledError, TokenBucket
+
+
+class ThrottlingError(Exception):
+    def __init__(self):
+        self.response = {'Error': {'Code': 'ThrottlingException'}}
+
+
+def test_expired_deadline_is_rejected_without_calling():
+    calls = []
+    throttle = ModelThrottle('test-expired')
+    with pytest.raises(ModelThrottledError):
+        throttle.call(lambda: calls.append(1), time.monotonic() - 5)
+    assert calls == []
+    assert throttle.stats()['rejections'] == 1
+
+
+def test_call_returns_result_within_deadline():
+    throttle = ModelThrottle('test-ok')
+    assert throttle.call(lambda: 'ok', time.monotonic() + 5) == 'ok'
+    assert throttle.stats()['inflight'] == 0
+
+
+def test_throttled_call_is_retried():
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ThrottlingError()
+        return 'ok'
+
+    throttle = ModelThrottle('test-retry')
+    assert throttle.call(fn, time.monotonic() + 5) == 'ok'
+    assert len(attempts) == 2
+    assert throttle.stats()['throttles'] == 1
+
+
+def test_token_bucket_refuses_wait_past_deadline():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire(time.monotonic() + 1)
+    assert not bucket.acquire(time.monotonic() + 0.01)
+
+
+def test_aimd_limit_halves_on_throttle_and_grows_on_success():
+    limiter = AIMDLimiter(initial=8, maximum=32)
+    assert limiter.acquire(time.monotonic() + 1)
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+    assert limiter.acquire(time.monotonic() + 1)
+    limiter.release(latency=0.01)
+    assert limiter.limit == pytest.approx(4.25)